@@ -5,11 +5,31 @@ Enhanced command-line interface for the Question Bank system.
 import argparse
 import sys
 import csv
+import io
+import random
 import time
 from pathlib import Path
 from qbank import QuestionBankManager
 
 
+CSV_BUFFER_SIZE = 1 << 20  # 1 MiB read buffer for bulk imports
+REQUIRED_CSV_HEADERS = frozenset({'question', 'correct_answer', 'wrong_answer1'})
+
+
+def _read_piped_line(prompt: str = "") -> str:
+    """input() replacement for piped stdin: write the prompt and read a raw line."""
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip('\n')
+
+
+# Scripted runs feed answers through a pipe; skip input()'s terminal handling for them
+_INPUT = input if sys.stdin is None or sys.stdin.isatty() else _read_piped_line
+
+
 def create_question_interactive(manager: QuestionBankManager):
     """Interactively create a new question."""
     print("\nCreating a new question...")
@@ -37,7 +57,7 @@ def create_question_interactive(manager: QuestionBankManager):
         return
     
     tags_input = input("\nEnter tags (comma-separated, optional): ").strip()
-    tags = [tag.strip() for tag in tags_input.split(",") if tag.strip()] if tags_input else []
+    tags = [tag for tag in map(str.strip, tags_input.split(",")) if tag]
     
     objective = input("\nEnter learning objective (what this question tests, optional): ").strip()
     objective = objective if objective else None
@@ -51,59 +71,89 @@ def create_question_interactive(manager: QuestionBankManager):
     print(f"Tags: {', '.join(question.tags) if question.tags else 'None'}")
 
 
+def _iter_csv_questions(reader, headers):
+    """Yield (question_text, correct_answer, wrong_answers, tags, objective) tuples from CSV rows."""
+    # Resolve column positions once so rows are indexed by int
+    idx = {name: i for i, name in enumerate(headers)}
+    question_idx = idx['question']
+    correct_idx = idx['correct_answer']
+    wrong_idx = [idx[f'wrong_answer{i}'] for i in range(1, 6) if f'wrong_answer{i}' in idx]  # Up to 5
+    tags_idx = idx.get('tags')
+    objective_idx = idx.get('objective')
+    # Rows must reach the last column that is read
+    used_idx = [question_idx, correct_idx, *wrong_idx, tags_idx, objective_idx]
+    min_columns = max(i for i in used_idx if i is not None) + 1
+    _s = str.strip
+    
+    for row_num, row in enumerate(reader, start=2):
+        if not row:
+            continue  # Blank line
+        
+        if len(row) < min_columns:
+            print(f"Warning: Row {row_num} has {len(row)} columns, expected at least {min_columns}, skipping")
+            continue
+        
+        try:
+            wrong_answers = []
+            
+            # Add wrong answers
+            for i in wrong_idx:
+                wrong = _s(row[i])
+                if wrong:
+                    wrong_answers.append(wrong)
+            
+            if not wrong_answers:
+                print(f"Warning: Row {row_num} has no wrong answers, skipping")
+                continue
+            
+            # Parse tags
+            tags = []
+            if tags_idx is not None:
+                tags = [tag for tag in map(_s, row[tags_idx].split(',')) if tag]
+            
+            # Get objective
+            objective = None
+            if objective_idx is not None:
+                objective = _s(row[objective_idx]) or None
+            
+            yield (
+                _s(row[question_idx]),
+                _s(row[correct_idx]),
+                wrong_answers,
+                tags,
+                objective
+            )
+            
+        except Exception as e:
+            print(f"Error on row {row_num}: {e}")
+            continue
+
+
 def bulk_import_questions(manager: QuestionBankManager, file_path: str):
     """Import questions from a CSV file."""
     print(f"\n=== Bulk Import from {file_path} ===")
     
     try:
-        questions_added = 0
-        with open(file_path, 'r', newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
+        with open(file_path, 'rb', buffering=CSV_BUFFER_SIZE) as raw, \
+                io.TextIOWrapper(raw, encoding='utf-8', newline='') as csvfile:
+            reader = csv.reader(csvfile)
+            headers = next(reader, [])
             expected_headers = ['question', 'correct_answer', 'wrong_answer1', 'wrong_answer2', 'tags', 'objective']
             
-            if not all(header in reader.fieldnames for header in expected_headers[:3]):
-                print("CSV must have at least: question, correct_answer, wrong_answer1, wrong_answer2")
+            missing = REQUIRED_CSV_HEADERS - set(headers)
+            if missing:
+                required = [header for header in expected_headers if header in REQUIRED_CSV_HEADERS]
+                print(f"CSV must have at least: {', '.join(required)}")
                 print(f"Expected headers: {', '.join(expected_headers)}")
-                print(f"Found headers: {', '.join(reader.fieldnames)}")
+                print(f"Found headers: {', '.join(headers)}")
+                print(f"Missing headers: {', '.join(header for header in required if header in missing)}")
                 return
             
-            for row_num, row in enumerate(reader, start=2):
-                try:
-                    wrong_answers = []
-                    
-                    # Add wrong answers
-                    for i in range(1, 6):  # Support up to 5 wrong answers
-                        wrong_key = f'wrong_answer{i}'
-                        if wrong_key in row and row[wrong_key].strip():
-                            wrong_answers.append(row[wrong_key].strip())
-                    
-                    if not wrong_answers:
-                        print(f"Warning: Row {row_num} has no wrong answers, skipping")
-                        continue
-                    
-                    # Parse tags
-                    tags = []
-                    if 'tags' in row and row['tags'].strip():
-                        tags = [tag.strip() for tag in row['tags'].split(',')]
-                    
-                    # Get objective
-                    objective = row.get('objective', '').strip() or None
-                    
-                    # Create question
-                    manager.create_multiple_choice_question(
-                        question_text=row['question'].strip(),
-                        correct_answer=row['correct_answer'].strip(),
-                        wrong_answers=wrong_answers,
-                        tags=tags,
-                        objective=objective
-                    )
-                    questions_added += 1
-                    
-                except Exception as e:
-                    print(f"Error on row {row_num}: {e}")
-                    continue
+            created = manager.bulk_create_multiple_choice_questions(
+                _iter_csv_questions(reader, headers)
+            )
         
-        print(f"\n✓ Successfully imported {questions_added} questions!")
+        print(f"\n✓ Successfully imported {len(created)} questions!")
         
     except FileNotFoundError:
         print(f"File not found: {file_path}")
@@ -122,11 +172,18 @@ def search_questions(manager: QuestionBankManager, query: str):
         return
     
     print(f"Found {len(results)} question(s):")
+    
+    # Build the whole listing and write it to stdout once
+    out = io.StringIO()
+    get_difficulty = manager.elo_system.get_difficulty_category
     for i, question in enumerate(results, 1):
-        print(f"\n{i}. {question.question_text}")
-        print(f"   Tags: {', '.join(question.tags) if question.tags else 'None'}")
-        print(f"   Difficulty: {manager.elo_system.get_difficulty_category(question.elo_rating)}")
-        print(f"   Accuracy: {question.accuracy:.1f}% ({question.times_correct}/{question.times_answered})")
+        out.write(
+            f"\n{i}. {question.question_text}\n"
+            f"   Tags: {', '.join(question.tags) if question.tags else 'None'}\n"
+            f"   Difficulty: {get_difficulty(question.elo_rating)}\n"
+            f"   Accuracy: {question.accuracy:.1f}% ({question.times_correct}/{question.times_answered})\n"
+        )
+    sys.stdout.write(out.getvalue())
 
 
 def practice_by_subject(manager: QuestionBankManager, subject: str = None):
@@ -135,25 +192,22 @@ def practice_by_subject(manager: QuestionBankManager, subject: str = None):
     
     # Get available tags if no subject specified
     if not subject:
-        all_tags = set()
-        for question in manager.question_bank.questions.values():
-            all_tags.update(question.tags)
+        tag_counts = manager.get_tag_counts()
         
-        if not all_tags:
+        if not tag_counts:
             print("No tags found in question bank.")
             return
         
         print("Available subjects:")
-        tags_list = sorted(all_tags)
+        tags_list = sorted(tag_counts)
         for i, tag in enumerate(tags_list, 1):
-            count = len(manager.get_questions_by_tag(tag))
-            print(f"  {i}. {tag} ({count} questions)")
+            print(f"  {i}. {tag} ({tag_counts[tag]} questions)")
         
         print(f"  {len(tags_list) + 1}. All subjects (mixed practice)")
         
         while True:
             try:
-                choice = input(f"\nSelect subject (1-{len(tags_list) + 1}): ").strip()
+                choice = _INPUT(f"\nSelect subject (1-{len(tags_list) + 1}): ").strip()
                 choice_idx = int(choice) - 1
                 
                 if choice_idx == len(tags_list):
@@ -172,7 +226,7 @@ def practice_by_subject(manager: QuestionBankManager, subject: str = None):
     # Get number of questions
     while True:
         try:
-            max_questions = input("Number of questions (default 10): ").strip()
+            max_questions = _INPUT("Number of questions (default 10): ").strip()
             max_questions = int(max_questions) if max_questions else 10
             if max_questions > 0:
                 break
@@ -203,24 +257,24 @@ def practice_by_subject(manager: QuestionBankManager, subject: str = None):
         print(f"Subject: {', '.join(selected_tags)}")
     print("Enter 'q' to quit early\n")
     
+    get_difficulty = manager.elo_system.get_difficulty_category
     for i, question in enumerate(questions, 1):
         print(f"Question {i}/{len(questions)}")
         print(f"Tags: {', '.join(question.tags)}")
-        print(f"Difficulty: {manager.elo_system.get_difficulty_category(question.elo_rating)}")
+        print(f"Difficulty: {get_difficulty(question.elo_rating)}")
         print(f"\n{question.question_text}")
         
         # Show answers in random order
-        import random
-        answers = question.answers.copy()
-        random.shuffle(answers)
+        answers = question.answers
+        order = random.sample(range(len(answers)), len(answers))
         
         print("\nOptions:")
-        for j, answer in enumerate(answers, 1):
-            print(f"  {j}. {answer.text}")
+        for j, k in enumerate(order, 1):
+            print(f"  {j}. {answers[k].text}")
         
         # Get user response
         while True:
-            response = input(f"\nYour answer (1-{len(answers)}) or 'q' to quit: ").strip().lower()
+            response = _INPUT(f"\nYour answer (1-{len(answers)}) or 'q' to quit: ").strip().lower()
             
             if response == 'q':
                 print("Session ended early.")
@@ -230,7 +284,7 @@ def practice_by_subject(manager: QuestionBankManager, subject: str = None):
             try:
                 answer_idx = int(response) - 1
                 if 0 <= answer_idx < len(answers):
-                    selected_answer = answers[answer_idx]
+                    selected_answer = answers[order[answer_idx]]
                     break
                 else:
                     print(f"Please enter a number between 1 and {len(answers)}")
@@ -278,20 +332,7 @@ def reset_progress(manager: QuestionBankManager):
     confirm = input("\nType 'RESET' to confirm: ").strip()
     
     if confirm == 'RESET':
-        # Reset user progress
-        manager.user_tracker.users[manager.current_user_id] = type(manager.user_tracker.users[manager.current_user_id])()
-        
-        # Reset question statistics
-        for question in manager.question_bank.questions.values():
-            question.elo_rating = 1200.0
-            question.times_answered = 0
-            question.times_correct = 0
-            question.last_studied = None
-            question.next_review = None
-            question.interval_days = 1.0
-            question.ease_factor = 2.5
-            question.repetition_count = 0
-        
+        manager.reset_progress()
         print("✓ Progress reset successfully!")
     else:
         print("Reset cancelled.")
@@ -299,7 +340,7 @@ def reset_progress(manager: QuestionBankManager):
 
 def list_questions(manager: QuestionBankManager):
     """List all questions in the bank."""
-    questions = list(manager.question_bank.questions.values())
+    questions = manager.question_bank.questions
     
     if not questions:
         print("No questions in the bank.")
@@ -308,34 +349,42 @@ def list_questions(manager: QuestionBankManager):
     print(f"\nFound {len(questions)} questions:")
     print("-" * 80)
     
-    for i, question in enumerate(questions, 1):
-        print(f"{i}. {question.question_text}")
-        print(f"   Correct: {question.correct_answer.text if question.correct_answer else 'N/A'}")
+    # Build the whole listing and write it to stdout once
+    out = io.StringIO()
+    get_difficulty = manager.elo_system.get_difficulty_category
+    for i, question in enumerate(questions.values(), 1):
+        out.write(
+            f"{i}. {question.question_text}\n"
+            f"   Correct: {question.correct_answer.text if question.correct_answer else 'N/A'}\n"
+        )
         if question.objective:
-            print(f"   Objective: {question.objective}")
-        print(f"   Tags: {', '.join(question.tags) if question.tags else 'None'}")
-        print(f"   Difficulty: {manager.elo_system.get_difficulty_category(question.elo_rating)}")
-        print(f"   Accuracy: {question.accuracy:.1f}% ({question.times_correct}/{question.times_answered})")
-        print()
+            out.write(f"   Objective: {question.objective}\n")
+        out.write(
+            f"   Tags: {', '.join(question.tags) if question.tags else 'None'}\n"
+            f"   Difficulty: {get_difficulty(question.elo_rating)}\n"
+            f"   Accuracy: {question.accuracy:.1f}% ({question.times_correct}/{question.times_answered})\n"
+            "\n"
+        )
+    sys.stdout.write(out.getvalue())
 
 
 def start_study_session_interactive(manager: QuestionBankManager):
     """Start an interactive study session."""
     
     # Check if there are questions due
-    due_questions = manager.question_bank.get_questions_due_for_review()
-    if not due_questions:
+    due_count = manager.question_bank.count_questions_due()
+    if not due_count:
         print("No questions are due for review!")
         return
     
-    print(f"\n{len(due_questions)} questions are due for review.")
+    print(f"\n{due_count} questions are due for review.")
     
     # Ask for session size
-    max_questions = input(f"How many questions? (max {len(due_questions)}, Enter for all): ").strip()
+    max_questions = _INPUT(f"How many questions? (max {due_count}, Enter for all): ").strip()
     if max_questions:
         try:
             max_questions = int(max_questions)
-            max_questions = min(max_questions, len(due_questions))
+            max_questions = min(max_questions, due_count)
         except ValueError:
             max_questions = None
     else:
@@ -351,29 +400,29 @@ def start_study_session_interactive(manager: QuestionBankManager):
     print(f"\nStarting study session with {len(questions)} questions...")
     print("=" * 50)
     
+    get_difficulty = manager.elo_system.get_difficulty_category
     for i, question in enumerate(questions, 1):
         print(f"\nQuestion {i}/{len(questions)}: {question.question_text}")
         
         # Show answers in random order
-        import random
-        answers = question.answers.copy()
-        random.shuffle(answers)
+        answers = question.answers
+        order = random.sample(range(len(answers)), len(answers))
         
         print("Options:")
-        for j, answer in enumerate(answers, 1):
-            print(f"  {j}. {answer.text}")
+        for j, k in enumerate(order, 1):
+            print(f"  {j}. {answers[k].text}")
         
         # Get user choice
         while True:
             try:
-                choice = input(f"\nYour answer (1-{len(answers)}): ").strip()
+                choice = _INPUT(f"\nYour answer (1-{len(answers)}): ").strip()
                 if choice.lower() in ['q', 'quit', 'exit']:
                     print("Exiting study session...")
                     return
                 
                 choice_num = int(choice)
                 if 1 <= choice_num <= len(answers):
-                    selected_answer = answers[choice_num - 1]
+                    selected_answer = answers[order[choice_num - 1]]
                     break
                 else:
                     print(f"Please enter a number between 1 and {len(answers)}")
@@ -393,7 +442,7 @@ def start_study_session_interactive(manager: QuestionBankManager):
         if selected_answer.explanation:
             print(f"Explanation: {selected_answer.explanation}")
         
-        print(f"Question difficulty: {manager.elo_system.get_difficulty_category(result['question_rating'])}")
+        print(f"Question difficulty: {get_difficulty(result['question_rating'])}")
         print(f"Your rating: {result['user_rating']:.1f}")
     
     # End session and show results
@@ -459,31 +508,20 @@ def show_detailed_stats(manager: QuestionBankManager):
     print(f"Total Sessions: {stats['total_sessions']}")
     print(f"Recent Accuracy: {stats['recent_accuracy']:.1f}%")
     
+    breakdown = manager.get_performance_breakdown()
+    
     # Subject breakdown
     print(f"\nSubject Performance:")
-    subjects = {}
-    for question in manager.question_bank.questions.values():
-        if question.times_answered > 0:
-            for tag in question.tags:
-                if tag not in subjects:
-                    subjects[tag] = {'correct': 0, 'total': 0}
-                subjects[tag]['correct'] += question.times_correct
-                subjects[tag]['total'] += question.times_answered
-    
-    for subject, data in sorted(subjects.items()):
-        accuracy = (data['correct'] / data['total']) * 100 if data['total'] > 0 else 0
-        print(f"  {subject}: {accuracy:.1f}% ({data['correct']}/{data['total']})")
+    for subject, (correct, total) in sorted(breakdown["subjects"].items()):
+        accuracy = (correct / total) * 100
+        print(f"  {subject}: {accuracy:.1f}% ({correct}/{total})")
     
     # Difficulty distribution
     print(f"\nDifficulty Distribution:")
-    difficulties = {"Beginner": 0, "Easy": 0, "Medium": 0, "Hard": 0, "Expert": 0}
-    for question in manager.question_bank.questions.values():
-        difficulty = manager.elo_system.get_difficulty_category(question.elo_rating)
-        difficulties[difficulty] += 1
-    
-    for difficulty, count in difficulties.items():
+    total_questions = len(manager.question_bank.questions) or 1
+    for difficulty, count in breakdown["difficulty"].items():
         if count > 0:
-            percentage = (count / len(manager.question_bank.questions)) * 100
+            percentage = count * 100.0 / total_questions
             print(f"  {difficulty}: {count} questions ({percentage:.1f}%)")
     
     # Review forecast
@@ -494,6 +532,12 @@ def show_detailed_stats(manager: QuestionBankManager):
             print(f"  {date}: {count} questions")
 
 
+def export_questions(manager: QuestionBankManager, file_path: str):
+    """Export the question bank to another file."""
+    manager.export_bank(file_path)
+    print(f"Exported question bank to {file_path}")
+
+
 def main():
     """Main CLI function."""
     
@@ -506,38 +550,48 @@ def main():
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
     
     # Add question command
-    subparsers.add_parser("add", help="Add a new question interactively")
+    add_parser = subparsers.add_parser("add", help="Add a new question interactively")
+    add_parser.set_defaults(func=lambda manager, args: create_question_interactive(manager))
     
     # Import command
     import_parser = subparsers.add_parser("import", help="Import questions from CSV file")
     import_parser.add_argument("file", help="CSV file path")
+    import_parser.set_defaults(func=lambda manager, args: bulk_import_questions(manager, args.file))
     
     # List questions command
-    subparsers.add_parser("list", help="List all questions")
+    list_parser = subparsers.add_parser("list", help="List all questions")
+    list_parser.set_defaults(func=lambda manager, args: list_questions(manager))
     
     # Search command
     search_parser = subparsers.add_parser("search", help="Search questions")
     search_parser.add_argument("query", help="Search query")
+    search_parser.set_defaults(func=lambda manager, args: search_questions(manager, args.query))
     
     # Study command
-    subparsers.add_parser("study", help="Start a study session")
+    study_parser = subparsers.add_parser("study", help="Start a study session")
+    study_parser.set_defaults(func=lambda manager, args: start_study_session_interactive(manager))
     
     # Practice command
     practice_parser = subparsers.add_parser("practice", help="Practice by subject")
     practice_parser.add_argument("--subject", "-s", help="Subject/tag to practice")
+    practice_parser.set_defaults(func=lambda manager, args: practice_by_subject(manager, args.subject))
     
     # Stats command
-    subparsers.add_parser("stats", help="Show statistics")
+    stats_parser = subparsers.add_parser("stats", help="Show statistics")
+    stats_parser.set_defaults(func=lambda manager, args: show_statistics(manager))
     
     # Detailed stats command
-    subparsers.add_parser("detailed-stats", help="Show detailed statistics")
+    detailed_stats_parser = subparsers.add_parser("detailed-stats", help="Show detailed statistics")
+    detailed_stats_parser.set_defaults(func=lambda manager, args: show_detailed_stats(manager))
     
     # Reset command
-    subparsers.add_parser("reset", help="Reset user progress")
+    reset_parser = subparsers.add_parser("reset", help="Reset user progress")
+    reset_parser.set_defaults(func=lambda manager, args: reset_progress(manager))
     
     # Export command
     export_parser = subparsers.add_parser("export", help="Export question bank")
     export_parser.add_argument("file", help="Output file path")
+    export_parser.set_defaults(func=lambda manager, args: export_questions(manager, args.file))
     
     args = parser.parse_args()
     
@@ -562,37 +616,7 @@ def main():
     
     # Execute command
     try:
-        if args.command == "add":
-            create_question_interactive(manager)
-            
-        elif args.command == "import":
-            bulk_import_questions(manager, args.file)
-            
-        elif args.command == "list":
-            list_questions(manager)
-            
-        elif args.command == "search":
-            search_questions(manager, args.query)
-            
-        elif args.command == "study":
-            start_study_session_interactive(manager)
-            
-        elif args.command == "practice":
-            practice_by_subject(manager, args.subject)
-            
-        elif args.command == "stats":
-            show_statistics(manager)
-            
-        elif args.command == "detailed-stats":
-            show_detailed_stats(manager)
-            
-        elif args.command == "reset":
-            reset_progress(manager)
-            
-        elif args.command == "export":
-            manager.export_bank(args.file)
-            print(f"Exported question bank to {args.file}")
-            
+        args.func(manager, args)
     except KeyboardInterrupt:
         print("\nOperation cancelled.")
         return
@@ -600,9 +624,13 @@ def main():
         print(f"Error: {e}")
         return
     
-    # Save the bank
+    # Save the bank only if the command changed it
+    if not manager.dirty:
+        return
+    
     try:
         manager.export_bank(str(bank_file))
+        manager.mark_saved()
         print(f"\nQuestion bank saved to {bank_file}")
     except Exception as e:
         print(f"Error saving bank: {e}")
@@ -3,7 +3,96 @@ Example script showing advanced usage of the Question Bank system.
 """
 
 from qbank import QuestionBankManager
+import io
 import random
+import sys
+from statistics import fmean
+
+
+# Math questions
+_MATH_QUESTIONS = (
+    {
+        "question": "What is the derivative of x²?",
+        "correct_answer": "2x",
+        "wrong_answers": ("x²", "x", "2x²"),
+        "tags": ("math", "calculus", "derivatives")
+    },
+    {
+        "question": "What is the integral of 2x?",
+        "correct_answer": "x² + C",
+        "wrong_answers": ("2x² + C", "x + C", "2"),
+        "tags": ("math", "calculus", "integrals")
+    },
+    {
+        "question": "What is the quadratic formula?",
+        "correct_answer": "x = (-b ± √(b²-4ac)) / 2a",
+        "wrong_answers": ("x = (-b ± √(b²+4ac)) / 2a", "x = (b ± √(b²-4ac)) / 2a", "x = (-b ± √(b²-4ac)) / a"),
+        "tags": ("math", "algebra", "quadratic")
+    }
+)
+
+# Science questions
+_SCIENCE_QUESTIONS = (
+    {
+        "question": "What is the speed of light in vacuum?",
+        "correct_answer": "299,792,458 m/s",
+        "wrong_answers": ("300,000,000 m/s", "299,792,458 km/s", "186,000 m/s"),
+        "tags": ("physics", "constants", "light")
+    },
+    {
+        "question": "What is the chemical formula for water?",
+        "correct_answer": "H₂O",
+        "wrong_answers": ("H₂O₂", "HO", "H₃O"),
+        "tags": ("chemistry", "compounds", "basic")
+    },
+    {
+        "question": "What is the powerhouse of the cell?",
+        "correct_answer": "Mitochondria",
+        "wrong_answers": ("Nucleus", "Ribosome", "Endoplasmic reticulum"),
+        "tags": ("biology", "cell", "organelles")
+    }
+)
+
+# Programming questions
+_PROGRAMMING_QUESTIONS = (
+    {
+        "question": "Which data structure uses LIFO (Last In, First Out)?",
+        "correct_answer": "Stack",
+        "wrong_answers": ("Queue", "Array", "Linked List"),
+        "tags": ("programming", "data-structures", "stack")
+    },
+    {
+        "question": "What does 'Big O' notation describe?",
+        "correct_answer": "Time or space complexity",
+        "wrong_answers": ("Code readability", "Memory usage only", "Execution speed only"),
+        "tags": ("programming", "algorithms", "complexity")
+    },
+    {
+        "question": "In Python, what does the 'len()' function return?",
+        "correct_answer": "The number of items in an object",
+        "wrong_answers": ("The memory size of an object", "The type of an object", "The ID of an object"),
+        "tags": ("programming", "python", "built-ins")
+    }
+)
+
+# History questions
+_HISTORY_QUESTIONS = (
+    {
+        "question": "In which year did World War II end?",
+        "correct_answer": "1945",
+        "wrong_answers": ("1944", "1946", "1943"),
+        "tags": ("history", "world-war", "20th-century")
+    },
+    {
+        "question": "Who was the first President of the United States?",
+        "correct_answer": "George Washington",
+        "wrong_answers": ("Thomas Jefferson", "John Adams", "Benjamin Franklin"),
+        "tags": ("history", "usa", "presidents")
+    }
+)
+
+# Seed data, built once at import time
+_SEED_QUESTIONS = (*_MATH_QUESTIONS, *_SCIENCE_QUESTIONS, *_PROGRAMMING_QUESTIONS, *_HISTORY_QUESTIONS)
 
 
 def create_comprehensive_question_bank():
@@ -11,93 +100,10 @@ def create_comprehensive_question_bank():
     
     manager = QuestionBankManager("Comprehensive Study Bank", "student_001")
     
-    # Math questions
-    math_questions = [
-        {
-            "question": "What is the derivative of x²?",
-            "correct_answer": "2x",
-            "wrong_answers": ["x²", "x", "2x²"],
-            "tags": ["math", "calculus", "derivatives"]
-        },
-        {
-            "question": "What is the integral of 2x?",
-            "correct_answer": "x² + C",
-            "wrong_answers": ["2x² + C", "x + C", "2"],
-            "tags": ["math", "calculus", "integrals"]
-        },
-        {
-            "question": "What is the quadratic formula?",
-            "correct_answer": "x = (-b ± √(b²-4ac)) / 2a",
-            "wrong_answers": ["x = (-b ± √(b²+4ac)) / 2a", "x = (b ± √(b²-4ac)) / 2a", "x = (-b ± √(b²-4ac)) / a"],
-            "tags": ["math", "algebra", "quadratic"]
-        }
-    ]
-    
-    # Science questions
-    science_questions = [
-        {
-            "question": "What is the speed of light in vacuum?",
-            "correct_answer": "299,792,458 m/s",
-            "wrong_answers": ["300,000,000 m/s", "299,792,458 km/s", "186,000 m/s"],
-            "tags": ["physics", "constants", "light"]
-        },
-        {
-            "question": "What is the chemical formula for water?",
-            "correct_answer": "H₂O",
-            "wrong_answers": ["H₂O₂", "HO", "H₃O"],
-            "tags": ["chemistry", "compounds", "basic"]
-        },
-        {
-            "question": "What is the powerhouse of the cell?",
-            "correct_answer": "Mitochondria",
-            "wrong_answers": ["Nucleus", "Ribosome", "Endoplasmic reticulum"],
-            "tags": ["biology", "cell", "organelles"]
-        }
-    ]
-    
-    # Programming questions
-    programming_questions = [
-        {
-            "question": "Which data structure uses LIFO (Last In, First Out)?",
-            "correct_answer": "Stack",
-            "wrong_answers": ["Queue", "Array", "Linked List"],
-            "tags": ["programming", "data-structures", "stack"]
-        },
-        {
-            "question": "What does 'Big O' notation describe?",
-            "correct_answer": "Time or space complexity",
-            "wrong_answers": ["Code readability", "Memory usage only", "Execution speed only"],
-            "tags": ["programming", "algorithms", "complexity"]
-        },
-        {
-            "question": "In Python, what does the 'len()' function return?",
-            "correct_answer": "The number of items in an object",
-            "wrong_answers": ["The memory size of an object", "The type of an object", "The ID of an object"],
-            "tags": ["programming", "python", "built-ins"]
-        }
-    ]
-    
-    # History questions
-    history_questions = [
-        {
-            "question": "In which year did World War II end?",
-            "correct_answer": "1945",
-            "wrong_answers": ["1944", "1946", "1943"],
-            "tags": ["history", "world-war", "20th-century"]
-        },
-        {
-            "question": "Who was the first President of the United States?",
-            "correct_answer": "George Washington",
-            "wrong_answers": ["Thomas Jefferson", "John Adams", "Benjamin Franklin"],
-            "tags": ["history", "usa", "presidents"]
-        }
-    ]
-    
     # Add all questions
-    all_questions = math_questions + science_questions + programming_questions + history_questions
-    manager.bulk_add_questions(all_questions)
+    manager.bulk_add_questions(_SEED_QUESTIONS)
     
-    print(f"Created question bank with {len(all_questions)} questions across multiple subjects.")
+    print(f"Created question bank with {len(_SEED_QUESTIONS)} questions across multiple subjects.")
     return manager
 
 
@@ -106,6 +112,10 @@ def simulate_learning_progress(manager: QuestionBankManager, sessions: int = 10)
     
     print(f"\nSimulating {sessions} study sessions...")
     
+    rand = random.random
+    choice = random.choice
+    uniform = random.uniform
+    
     for session_num in range(1, sessions + 1):
         print(f"\n--- Session {session_num} ---")
         
@@ -120,22 +130,27 @@ def simulate_learning_progress(manager: QuestionBankManager, sessions: int = 10)
             continue
         
         session_correct = 0
+        answers = []
+        
+        # Simulate getting progressively better (learning effect)
+        learning_factor = min(0.9, 0.4 + (session_num * 0.05))
         
         for question in questions:
-            # Simulate getting progressively better (learning effect)
-            learning_factor = min(0.9, 0.4 + (session_num * 0.05))
-            is_correct = random.random() < learning_factor
+            is_correct = rand() < learning_factor
             
             if is_correct:
                 selected_answer = question.correct_answer
                 session_correct += 1
             else:
                 incorrect_answers = question.incorrect_answers
-                selected_answer = random.choice(incorrect_answers)
+                selected_answer = choice(incorrect_answers)
             
-            # Submit answer with random response time
-            response_time = random.uniform(3.0, 15.0)
-            manager.answer_question(question.id, selected_answer.id, response_time)
+            # Collect answer with random response time
+            response_time = uniform(3.0, 15.0)
+            answers.append((question.id, selected_answer.id, response_time))
+        
+        # Submit the whole session's answers at once
+        manager.bulk_answer_questions(answers)
         
         # End session and show results
         session = manager.end_study_session()
@@ -151,68 +166,73 @@ def simulate_learning_progress(manager: QuestionBankManager, sessions: int = 10)
 def analyze_performance(manager: QuestionBankManager):
     """Analyze the user's performance and provide insights."""
     
-    print("\n" + "="*60)
-    print("PERFORMANCE ANALYSIS")
-    print("="*60)
+    # Build the whole report and write it to stdout once
+    out = io.StringIO()
+    write = out.write
+    
+    write("\n" + "="*60 + "\n")
+    write("PERFORMANCE ANALYSIS\n")
+    write("="*60 + "\n")
     
     # Overall statistics
     stats = manager.get_user_statistics()
-    print(f"Overall Performance:")
-    print(f"  User Level: {stats['user_level']}")
-    print(f"  User Rating: {stats['user_rating']:.1f}")
-    print(f"  Recent Accuracy: {stats['recent_accuracy']:.1f}%")
-    print(f"  Total Sessions: {stats['total_sessions']}")
-    print(f"  Questions Due: {stats['questions_due']}")
+    write(
+        f"Overall Performance:\n"
+        f"  User Level: {stats['user_level']}\n"
+        f"  User Rating: {stats['user_rating']:.1f}\n"
+        f"  Recent Accuracy: {stats['recent_accuracy']:.1f}%\n"
+        f"  Total Sessions: {stats['total_sessions']}\n"
+        f"  Questions Due: {stats['questions_due']}\n"
+    )
     
     # Subject analysis
-    print(f"\nSubject Performance:")
-    subjects = {"math": [], "science": [], "programming": [], "history": []}
+    write(f"\nSubject Performance:\n")
+    accuracies_by_tag = manager.get_performance_breakdown()["accuracies"]
     
-    for question in manager.question_bank.questions.values():
-        if question.times_answered > 0:
-            for subject in subjects.keys():
-                if subject in question.tags:
-                    subjects[subject].append(question.accuracy)
-                    break
-    
-    for subject, accuracies in subjects.items():
+    for subject in ("math", "science", "programming", "history"):
+        accuracies = accuracies_by_tag.get(subject)
         if accuracies:
-            avg_accuracy = sum(accuracies) / len(accuracies)
-            print(f"  {subject.capitalize()}: {avg_accuracy:.1f}% (from {len(accuracies)} questions)")
+            avg_accuracy = fmean(accuracies)
+            write(f"  {subject.capitalize()}: {avg_accuracy:.1f}% (from {len(accuracies)} questions)\n")
     
     # Difficult questions
     difficult_questions = manager.get_difficult_questions(5)
     if difficult_questions:
-        print(f"\nMost Challenging Questions:")
+        write(f"\nMost Challenging Questions:\n")
+        get_difficulty = manager.elo_system.get_difficulty_category
         for i, q in enumerate(difficult_questions, 1):
-            print(f"  {i}. {q.question_text[:50]}...")
-            print(f"     Accuracy: {q.accuracy:.1f}% | Difficulty: {manager.elo_system.get_difficulty_category(q.elo_rating)}")
+            write(
+                f"  {i}. {q.question_text[:50]}...\n"
+                f"     Accuracy: {q.accuracy:.1f}% | Difficulty: {get_difficulty(q.elo_rating)}\n"
+            )
     
     # Review forecast
     forecast = manager.get_review_forecast(7)
-    print(f"\nUpcoming Reviews (next 7 days):")
+    write(f"\nUpcoming Reviews (next 7 days):\n")
     total_upcoming = 0
     for date, count in forecast.items():
         if count > 0:
-            print(f"  {date}: {count} questions")
+            write(f"  {date}: {count} questions\n")
             total_upcoming += count
     
     if total_upcoming == 0:
-        print("  No reviews scheduled - great job staying on top of your studies!")
+        write("  No reviews scheduled - great job staying on top of your studies!\n")
     
     # Study recommendations
-    print(f"\nRecommendations:")
+    write(f"\nRecommendations:\n")
     if stats['recent_accuracy'] < 70:
-        print("  • Focus on reviewing incorrect answers and their explanations")
-        print("  • Consider shorter, more frequent study sessions")
+        write("  • Focus on reviewing incorrect answers and their explanations\n")
+        write("  • Consider shorter, more frequent study sessions\n")
     elif stats['recent_accuracy'] > 85:
-        print("  • Great job! Consider adding more challenging questions")
-        print("  • Try studying different subjects to broaden knowledge")
+        write("  • Great job! Consider adding more challenging questions\n")
+        write("  • Try studying different subjects to broaden knowledge\n")
     else:
-        print("  • Good progress! Maintain consistent study schedule")
+        write("  • Good progress! Maintain consistent study schedule\n")
     
     if stats['questions_due'] > 10:
-        print(f"  • You have {stats['questions_due']} questions due - consider a longer session")
+        write(f"  • You have {stats['questions_due']} questions due - consider a longer session\n")
+    
+    sys.stdout.write(out.getvalue())
 
 
 def demonstrate_advanced_features(manager: QuestionBankManager):
@@ -250,9 +270,8 @@ def demonstrate_advanced_features(manager: QuestionBankManager):
     
     # ELO-based recommendations
     user_rating = manager.user_tracker.get_user_rating(manager.current_user_id)
-    all_questions = list(manager.question_bank.questions.values())
     recommended = manager.user_tracker.get_recommended_questions(
-        manager.current_user_id, all_questions
+        manager.current_user_id, manager.question_bank.questions.values()
     )
     
     print(f"\nTop 3 questions recommended for your skill level ({user_rating:.0f}):")
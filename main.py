@@ -3,8 +3,21 @@
 Example usage of the Question Bank system.
 """
 
+import random
+
 from qbank import QuestionBankManager
 
+# Display labels for the keys returned by QuestionBankManager.get_user_statistics()
+_USER_STAT_LABELS = {
+    "user_rating": "User Rating",
+    "user_level": "User Level",
+    "total_sessions": "Total Sessions",
+    "recent_accuracy": "Recent Accuracy",
+    "total_questions_answered": "Total Questions Answered",
+    "questions_due": "Questions Due",
+    "total_questions": "Total Questions"
+}
+
 
 def create_sample_questions(manager: QuestionBankManager):
     """Create some sample questions for demonstration."""
@@ -78,14 +91,13 @@ def demonstrate_study_session(manager: QuestionBankManager):
     print(f"\nStarting session with {len(questions)} questions:")
     
     # Simulate answering questions
+    get_difficulty = manager.elo_system.get_difficulty_category
     for i, question in enumerate(questions, 1):
         print(f"\nQuestion {i}: {question.question_text}")
         print("Options:")
         
         # Shuffle answers for display
-        import random
-        answers = question.answers.copy()
-        random.shuffle(answers)
+        answers = random.sample(question.answers, len(question.answers))
         
         for j, answer in enumerate(answers, 1):
             print(f"  {j}. {answer.text}")
@@ -111,7 +123,7 @@ def demonstrate_study_session(manager: QuestionBankManager):
         if result['selected_answer'].explanation:
             print(f"Explanation: {result['selected_answer'].explanation}")
         
-        print(f"Question difficulty: {manager.elo_system.get_difficulty_category(result['question_rating'])}")
+        print(f"Question difficulty: {get_difficulty(result['question_rating'])}")
         print(f"Your rating: {result['user_rating']:.1f}")
         print(f"Next review: {result['next_review'].strftime('%Y-%m-%d %H:%M')}")
     
@@ -140,7 +152,8 @@ def show_statistics(manager: QuestionBankManager):
     user_stats = manager.get_user_statistics()
     print("User Statistics:")
     for key, value in user_stats.items():
-        print(f"  {key.replace('_', ' ').title()}: {value}")
+        label = _USER_STAT_LABELS.get(key) or key.replace('_', ' ').title()
+        print(f"  {label}: {value}")
     
     # Bank statistics
     bank_stats = manager.question_bank.get_statistics()
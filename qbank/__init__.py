@@ -2,10 +2,14 @@
 Question Bank Module - A spaced repetition learning system with ELO-based difficulty rating.
 """
 
-from .models import Question, Answer, QuestionBank, StudySession, AnswerResult
-from .spaced_repetition import SpacedRepetitionScheduler
-from .elo_rating import ELORatingSystem, UserRatingTracker
-from .manager import QuestionBankManager
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .models import Question, Answer, QuestionBank, StudySession, AnswerResult
+    from .spaced_repetition import SpacedRepetitionScheduler
+    from .elo_rating import ELORatingSystem, UserRatingTracker
+    from .manager import QuestionBankManager
 
 __version__ = "0.1.0"
 __all__ = [
@@ -18,4 +22,30 @@ __all__ = [
     "ELORatingSystem",
     "UserRatingTracker",
     "QuestionBankManager"
-]
\ No newline at end of file
+]
+
+# Public names are imported from their submodules on first access (PEP 562)
+_LAZY_IMPORTS = {
+    "Question": "models",
+    "Answer": "models",
+    "QuestionBank": "models",
+    "StudySession": "models",
+    "AnswerResult": "models",
+    "SpacedRepetitionScheduler": "spaced_repetition",
+    "ELORatingSystem": "elo_rating",
+    "UserRatingTracker": "elo_rating",
+    "QuestionBankManager": "manager"
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
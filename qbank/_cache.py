@@ -0,0 +1,92 @@
+"""
+Question bank and report file I/O: memoized loading and serialization.
+Uses orjson when it is installed and falls back to the standard json module.
+"""
+
+import functools
+import json
+import os
+import shutil
+import tempfile
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB write buffer for JSON exports
+
+
+@functools.lru_cache(maxsize=8)
+def _load_parsed(path: str, mtime_ns: int, size: int) -> Dict:
+    """Parse a bank file; mtime_ns and size only take part in the cache key."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_bank_data(filepath: str) -> Dict:
+    """
+    Load the parsed JSON contents of a question bank file.
+    
+    The result is shared between callers while the file is unchanged, so it
+    must be treated as read-only.
+    
+    Args:
+        filepath: Path to the JSON bank file
+        
+    Returns:
+        The deserialized bank data
+    """
+    path = os.path.abspath(filepath)
+    stat = os.stat(path)
+    return _load_parsed(path, stat.st_mtime_ns, stat.st_size)
+
+
+def _default_file_mode() -> int:
+    """Mode a newly created file gets under the current umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def dump_json(data: Dict, filepath: str, default: Optional[Callable[[Any], Any]] = None) -> None:
+    """
+    Write data to an indented JSON file.
+    
+    The data is written to a uniquely named temporary file next to the
+    destination which then replaces it, so an interrupted save never leaves a
+    truncated file and concurrent saves never share a temporary file. A
+    symlinked destination is followed and its target replaced, and the
+    target's permissions are kept.
+    
+    Args:
+        data: The serializable data
+        filepath: Destination path
+        default: Fallback serializer for values JSON does not handle natively
+    """
+    target = os.path.realpath(filepath)
+    directory, name = os.path.split(target)
+    f = tempfile.NamedTemporaryFile(
+        'wb', buffering=WRITE_BUFFER_SIZE, dir=directory, prefix=f".{name}.", suffix='.tmp', delete=False
+    )
+    tmp_path = f.name
+    try:
+        with f:
+            if orjson is not None:
+                f.write(orjson.dumps(data, default=default, option=orjson.OPT_INDENT_2))
+            else:
+                f.write(json.dumps(data, default=default, indent=2, ensure_ascii=False).encode('utf-8'))
+        # Temporary files are created private; give it the destination's mode instead
+        if os.path.exists(target):
+            shutil.copymode(target, tmp_path)
+        else:
+            os.chmod(tmp_path, _default_file_mode())
+        os.replace(tmp_path, target)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
@@ -3,15 +3,20 @@ Advanced analytics and progress tracking for the qBank system.
 Provides detailed insights into learning patterns and performance.
 """
 
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
-from collections import defaultdict
-import json
+from collections import Counter, defaultdict
+from bisect import bisect_left, bisect_right, insort
+from array import array
+import copy
 import math
+import sys
 
+from ._cache import dump_json
 
-@dataclass
+
+@dataclass(slots=True)
 class LearningSession:
     """Detailed session analytics."""
     session_id: str
@@ -47,7 +52,7 @@ class LearningSession:
         return self.total_response_time / self.questions_attempted
 
 
-@dataclass
+@dataclass(slots=True)
 class LearningMetrics:
     """Comprehensive learning metrics for a user."""
     user_id: str
@@ -57,7 +62,9 @@ class LearningMetrics:
     streak_current: int = 0
     streak_longest: int = 0
     mastery_levels: Dict[str, float] = field(default_factory=dict)  # subject -> mastery %
-    learning_curve: List[Tuple[datetime, float]] = field(default_factory=list)  # date, accuracy
+    # Learning curve as parallel columns: session end times and their accuracies
+    learning_curve_times: List[datetime] = field(default_factory=list)
+    learning_curve_accuracy: array = field(default_factory=lambda: array('d'))
     retention_rate: float = 0.0
     
     @property
@@ -66,6 +73,90 @@ class LearningMetrics:
         if self.total_questions == 0:
             return 0.0
         return (self.total_correct / self.total_questions) * 100
+    
+    @property
+    def learning_curve(self) -> List[Tuple[datetime, float]]:
+        """Learning curve as (date, accuracy) pairs."""
+        return list(zip(self.learning_curve_times, self.learning_curve_accuracy))
+
+
+# Retention curves for whole-percent accuracies, tabulated per day up to a year
+RETENTION_TABLE_DAYS = 365
+_retention_tables: Dict[int, Tuple[float, ...]] = {}
+
+
+def _retention_probability(days_since_last_study: int, original_accuracy: float) -> float:
+    """Forgetting-curve retention, read from a per-accuracy table where one applies."""
+    # Based on Ebbinghaus forgetting curve
+    if days_since_last_study <= 0:
+        return original_accuracy / 100.0
+    
+    if (type(days_since_last_study) is int and days_since_last_study <= RETENTION_TABLE_DAYS
+            and 0 < original_accuracy <= 100 and original_accuracy == int(original_accuracy)):
+        table = _retention_tables.get(int(original_accuracy))
+        if table is None:
+            table = _retention_tables[int(original_accuracy)] = tuple(
+                _forgetting_curve(days, original_accuracy) for days in range(RETENTION_TABLE_DAYS + 1)
+            )
+        return table[days_since_last_study]
+    
+    return _forgetting_curve(days_since_last_study, original_accuracy)
+
+
+def _forgetting_curve(days_since_last_study: float, original_accuracy: float) -> float:
+    """Evaluate the forgetting curve directly."""
+    # Simplified forgetting curve: R(t) = e^(-t/S)
+    # Where S is the stability (higher for better initial performance)
+    stability = original_accuracy / 10.0  # Higher accuracy = better retention
+    retention = math.exp(-days_since_last_study / stability)
+    
+    return max(0.1, retention)  # Minimum 10% retention
+
+
+def _start_time(session: LearningSession) -> datetime:
+    return session.start_time
+
+
+@dataclass
+class _SessionLog:
+    """A user's sessions in start_time order, with their figures captured in parallel columns."""
+    sessions: List[LearningSession] = field(default_factory=list)
+    accuracy: array = field(default_factory=lambda: array('d'))
+    response_time: array = field(default_factory=lambda: array('d'))
+    duration: array = field(default_factory=lambda: array('d'))
+    hour_counts: List[int] = field(default_factory=lambda: [0] * 24)  # sessions per start hour
+    subject_counts: Counter = field(default_factory=Counter)
+    
+    def __len__(self) -> int:
+        return len(self.sessions)
+    
+    def add(self, session: LearningSession, accuracy: float, duration: float):
+        """Insert a session with its precomputed accuracy and duration, keeping start_time order."""
+        index = bisect_right(self.sessions, session.start_time, key=_start_time)
+        self.sessions.insert(index, session)
+        self.accuracy.insert(index, accuracy)
+        self.response_time.insert(index, session.average_response_time)
+        self.duration.insert(index, duration)
+        self.hour_counts[session.start_time.hour] += 1
+        self.subject_counts.update(map(sys.intern, session.subjects_practiced))
+    
+    def discard(self, session: LearningSession):
+        """Remove a previously added session."""
+        index = next(i for i, s in enumerate(self.sessions) if s is session)
+        del self.sessions[index]
+        del self.accuracy[index]
+        del self.response_time[index]
+        del self.duration[index]
+        self.hour_counts[session.start_time.hour] -= 1
+        self._decrement(self.subject_counts, session.subjects_practiced)
+    
+    @staticmethod
+    def _decrement(counts: Counter, keys):
+        """Lower each key's count, dropping keys that reach zero."""
+        for key in keys:
+            counts[key] -= 1
+            if not counts[key]:
+                del counts[key]
 
 
 class AdvancedAnalytics:
@@ -74,42 +165,126 @@ class AdvancedAnalytics:
     def __init__(self):
         self.sessions: Dict[str, LearningSession] = {}
         self.user_metrics: Dict[str, LearningMetrics] = {}
+        self._session_logs: Dict[str, _SessionLog] = defaultdict(_SessionLog)
+        # Sorted per-user standings for comparative analytics, the values each user
+        # entered them with, and their exact totals (computed on demand)
+        self._accuracies: List[float] = []
+        self._study_times: List[float] = []
+        self._standings: Dict[str, Tuple[Optional[float], float]] = {}
+        self._standing_totals: Optional[Tuple[float, float]] = None
+        # Report caches, dropped when the sessions they summarize change
+        self._insights_cache: Dict[str, Dict[str, Any]] = {}
+        self._comparative_cache: Dict[str, Dict[str, Any]] = {}
     
     def record_session(self, session: LearningSession):
         """Record a learning session."""
+        self.record_sessions((session,))
+    
+    def record_sessions(self, sessions: Iterable[LearningSession]):
+        """
+        Record several learning sessions in order, e.g. when replaying history.
+        
+        Equivalent to calling record_session for each session, but every
+        affected user's comparative standing is updated once for the batch.
+        
+        Args:
+            sessions: Sessions to record, oldest first
+        """
+        touched: Dict[str, LearningMetrics] = {}
+        try:
+            for session in sessions:
+                self._apply_session(session, touched)
+        finally:
+            for user_id, metrics in touched.items():
+                self._enter_standing(user_id, metrics)
+            if touched:
+                self._comparative_cache.clear()
+    
+    def _apply_session(self, session: LearningSession, touched: Dict[str, LearningMetrics]):
+        """Record one session, leaving its user out of the standings and in touched."""
+        previous = self.sessions.get(session.session_id)
+        if previous is not None:
+            self._session_logs[previous.user_id].discard(previous)
+            self._insights_cache.pop(previous.user_id, None)
         self.sessions[session.session_id] = session
         
-        # Update user metrics
-        if session.user_id not in self.user_metrics:
-            self.user_metrics[session.user_id] = LearningMetrics(session.user_id)
+        # Interned ids and subjects make the per-user and per-subject keys cheap to match
+        user_id = sys.intern(session.user_id)
+        self._insights_cache.pop(user_id, None)
         
-        metrics = self.user_metrics[session.user_id]
-        metrics.total_study_time += session.duration_minutes
+        # Derive the session figures once for the log, metrics and mastery updates
+        accuracy = session.accuracy
+        duration = session.duration_minutes
+        self._session_logs[user_id].add(session, accuracy, duration)
+        
+        # Update user metrics, taking the user out of the standings until the batch is done
+        metrics = self.user_metrics.get(user_id)
+        if metrics is None:
+            metrics = self.user_metrics[user_id] = LearningMetrics(user_id)
+        if user_id not in touched:
+            self._withdraw_standing(user_id)
+        touched[user_id] = metrics
+        
+        metrics.total_study_time += duration
         metrics.total_questions += session.questions_attempted
         metrics.total_correct += session.questions_correct
         
         # Update learning curve
         if session.end_time:
-            metrics.learning_curve.append((session.end_time, session.accuracy))
-        
-        # Update mastery levels for subjects
-        for subject in session.subjects_practiced:
-            if subject not in metrics.mastery_levels:
-                metrics.mastery_levels[subject] = 0.0
-            
-            # Simple mastery calculation based on recent performance
-            current_mastery = metrics.mastery_levels[subject]
-            session_performance = session.accuracy / 100.0
-            # Weighted average with more weight on recent performance
-            metrics.mastery_levels[subject] = (current_mastery * 0.7) + (session_performance * 0.3)
+            metrics.learning_curve_times.append(session.end_time)
+            metrics.learning_curve_accuracy.append(accuracy)
+        
+        # Update mastery levels for subjects: a weighted average with more
+        # weight on recent performance, starting from zero for new subjects
+        mastery_levels = metrics.mastery_levels
+        performance_weight = (accuracy / 100.0) * 0.3
+        for subject in map(sys.intern, session.subjects_practiced):
+            mastery_levels[subject] = (mastery_levels.get(subject, 0.0) * 0.7) + performance_weight
+    
+    def _enter_standing(self, user_id: str, metrics: LearningMetrics):
+        """Add a user's accuracy and study time to the sorted standings."""
+        accuracy = metrics.overall_accuracy if metrics.total_questions > 0 else None
+        if accuracy is not None:
+            insort(self._accuracies, accuracy)
+        insort(self._study_times, metrics.total_study_time)
+        self._standings[user_id] = (accuracy, metrics.total_study_time)
+        self._standing_totals = None
+    
+    def _withdraw_standing(self, user_id: str):
+        """
+        Remove a user's standing, using the values it was entered with.
+        
+        The user's metrics may have been changed since, so they are not read here.
+        """
+        standing = self._standings.pop(user_id, None)
+        if standing is None:
+            return
+        accuracy, study_time = standing
+        if accuracy is not None:
+            self._remove_sorted(self._accuracies, accuracy)
+        self._remove_sorted(self._study_times, study_time)
+        self._standing_totals = None
+    
+    @staticmethod
+    def _remove_sorted(values: List[float], value: float):
+        """Remove one occurrence of value from a sorted list."""
+        index = bisect_left(values, value)
+        if index == len(values) or values[index] != value:
+            raise ValueError(f"Standing {value!r} is not in the standings")
+        del values[index]
     
     def get_learning_insights(self, user_id: str) -> Dict[str, Any]:
         """Generate comprehensive learning insights for a user."""
         if user_id not in self.user_metrics:
             return {"error": "No data available for user"}
         
+        # Callers get their own copy so changes to it never reach the cache
+        cached = self._insights_cache.get(user_id)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
         metrics = self.user_metrics[user_id]
-        user_sessions = [s for s in self.sessions.values() if s.user_id == user_id]
+        log = self._session_logs.get(user_id) or _SessionLog()
         
         insights = {
             "overview": {
@@ -119,89 +294,87 @@ class AdvancedAnalytics:
                 "current_streak": metrics.streak_current,
                 "longest_streak": metrics.streak_longest
             },
-            "performance_trends": self._analyze_performance_trends(user_sessions),
+            "performance_trends": self._analyze_performance_trends(log),
             "subject_mastery": metrics.mastery_levels,
-            "study_patterns": self._analyze_study_patterns(user_sessions),
-            "recommendations": self._generate_recommendations(user_id, user_sessions)
+            "study_patterns": self._analyze_study_patterns(log),
+            "recommendations": self._generate_recommendations(user_id, log)
         }
         
-        return insights
+        self._insights_cache[user_id] = insights
+        return copy.deepcopy(insights)
     
-    def _analyze_performance_trends(self, sessions: List[LearningSession]) -> Dict[str, Any]:
+    def _analyze_performance_trends(self, log: _SessionLog) -> Dict[str, Any]:
         """Analyze performance trends over time."""
-        if len(sessions) < 2:
+        if len(log) < 2:
             return {"trend": "insufficient_data"}
         
-        # Sort sessions by time
-        sorted_sessions = sorted(sessions, key=lambda s: s.start_time)
-        
-        # Calculate accuracy trend
-        recent_sessions = sorted_sessions[-5:]  # Last 5 sessions
-        older_sessions = sorted_sessions[-10:-5] if len(sorted_sessions) >= 10 else sorted_sessions[:-5]
+        # Calculate accuracy trend over the last 5 sessions and up to 5 before them
+        accuracy = log.accuracy
+        older_accuracy = accuracy[-10:-5]
+        recent_count = min(len(log), 5)
+        recent_avg = sum(accuracy[-5:]) / recent_count
         
-        if older_sessions:
-            recent_avg = sum(s.accuracy for s in recent_sessions) / len(recent_sessions)
-            older_avg = sum(s.accuracy for s in older_sessions) / len(older_sessions)
-            accuracy_change = recent_avg - older_avg
+        if older_accuracy:
+            accuracy_change = recent_avg - sum(older_accuracy) / len(older_accuracy)
         else:
             accuracy_change = 0.0
         
-        # Calculate response time trend
-        recent_response_time = sum(s.average_response_time for s in recent_sessions) / len(recent_sessions)
-        
         return {
             "accuracy_trend": "improving" if accuracy_change > 5 else "declining" if accuracy_change < -5 else "stable",
             "accuracy_change": accuracy_change,
-            "recent_accuracy": sum(s.accuracy for s in recent_sessions) / len(recent_sessions),
-            "average_response_time": recent_response_time,
-            "total_sessions": len(sessions)
+            "recent_accuracy": recent_avg,
+            "average_response_time": sum(log.response_time[-5:]) / recent_count,
+            "total_sessions": len(log)
         }
     
-    def _analyze_study_patterns(self, sessions: List[LearningSession]) -> Dict[str, Any]:
+    def _analyze_study_patterns(self, log: _SessionLog) -> Dict[str, Any]:
         """Analyze study patterns and habits."""
-        if not sessions:
+        if not log:
             return {}
         
         # Study frequency
-        session_dates = [s.start_time.date() for s in sessions]
+        session_dates = [s.start_time.date() for s in log.sessions]
         unique_dates = set(session_dates)
         days_studied = len(unique_dates)
         
-        # Time of day preferences
-        hour_counts = defaultdict(int)
-        for session in sessions:
-            hour_counts[session.start_time.hour] += 1
-        
-        preferred_hour = max(hour_counts.items(), key=lambda x: x[1])[0] if hour_counts else 12
+        # Time of day preferences (the earliest hour wins a tie)
+        hour_counts = log.hour_counts
+        preferred_hour = hour_counts.index(max(hour_counts))
         
         # Session length preferences
-        avg_session_length = sum(s.duration_minutes for s in sessions) / len(sessions)
+        avg_session_length = sum(log.duration) / len(log)
         
         # Subject preferences
-        subject_counts = defaultdict(int)
-        for session in sessions:
-            for subject in session.subjects_practiced:
-                subject_counts[subject] += 1
+        subject_counts = log.subject_counts
         
         return {
             "days_studied": days_studied,
             "average_session_length": avg_session_length,
             "preferred_study_hour": preferred_hour,
-            "most_practiced_subjects": dict(sorted(subject_counts.items(), key=lambda x: x[1], reverse=True)[:5])
+            "most_practiced_subjects": dict(subject_counts.most_common(5))
         }
     
-    def _generate_recommendations(self, user_id: str, sessions: List[LearningSession]) -> List[str]:
+    def _generate_recommendations(self, user_id: str, log: _SessionLog) -> List[str]:
         """Generate personalized learning recommendations."""
         recommendations = []
         
-        if not sessions:
+        if not log:
             return ["Start with a practice session to establish your baseline."]
         
         metrics = self.user_metrics[user_id]
-        recent_sessions = sorted(sessions, key=lambda s: s.start_time)[-5:]
+        
+        # Gather accuracy, length and subjects of the last 5 sessions in one pass
+        accuracy_total = length_total = 0.0
+        recent_subjects = set()
+        first_recent = max(len(log) - 5, 0)
+        for index in range(first_recent, len(log)):
+            accuracy_total += log.accuracy[index]
+            length_total += log.duration[index]
+            recent_subjects.update(log.sessions[index].subjects_practiced)
+        recent_count = len(log) - first_recent
         
         # Accuracy-based recommendations
-        recent_accuracy = sum(s.accuracy for s in recent_sessions) / len(recent_sessions)
+        recent_accuracy = accuracy_total / recent_count
         if recent_accuracy < 60:
             recommendations.append("Focus on reviewing incorrect answers and their explanations.")
             recommendations.append("Consider shorter sessions with immediate feedback.")
@@ -210,16 +383,11 @@ class AdvancedAnalytics:
             recommendations.append("Consider teaching others to reinforce your knowledge.")
         
         # Study frequency recommendations
-        if len(sessions) < 7:  # Less than a week of data
+        if len(log) < 7:  # Less than a week of data
             recommendations.append("Establish a consistent daily study routine.")
         
         # Subject balance recommendations
-        subject_counts = defaultdict(int)
-        for session in recent_sessions:
-            for subject in session.subjects_practiced:
-                subject_counts[subject] += 1
-        
-        if len(subject_counts) == 1:
+        if len(recent_subjects) == 1:
             recommendations.append("Try studying different subjects to broaden your knowledge.")
         
         # Mastery-based recommendations
@@ -231,7 +399,7 @@ class AdvancedAnalytics:
             recommendations.append(f"Focus on improving: {', '.join(low_mastery_subjects[:3])}.")
         
         # Session length recommendations
-        avg_length = sum(s.duration_minutes for s in recent_sessions) / len(recent_sessions)
+        avg_length = length_total / recent_count
         if avg_length < 5:
             recommendations.append("Consider longer study sessions for better retention.")
         elif avg_length > 30:
@@ -244,23 +412,34 @@ class AdvancedAnalytics:
         if user_id not in self.user_metrics:
             return {"error": "No data available for user"}
         
+        # The comparison is flat, so a shallow copy keeps the cache private
+        cached = self._comparative_cache.get(user_id)
+        if cached is not None:
+            return dict(cached)
+        
         user_metrics = self.user_metrics[user_id]
         
-        # Calculate system averages
-        all_accuracies = [m.overall_accuracy for m in self.user_metrics.values() if m.total_questions > 0]
-        all_study_times = [m.total_study_time for m in self.user_metrics.values()]
+        # System averages from the running totals
+        all_accuracies = self._accuracies
+        all_study_times = self._study_times
         
         if not all_accuracies:
             return {"error": "Insufficient system data for comparison"}
         
-        avg_accuracy = sum(all_accuracies) / len(all_accuracies)
-        avg_study_time = sum(all_study_times) / len(all_study_times)
+        # Exact sums, recomputed only after the standings change
+        if self._standing_totals is None:
+            self._standing_totals = (math.fsum(all_accuracies), math.fsum(all_study_times))
+        accuracy_total, study_time_total = self._standing_totals
+        avg_accuracy = accuracy_total / len(all_accuracies)
+        avg_study_time = study_time_total / len(all_study_times)
         
-        user_percentile_accuracy = sum(1 for acc in all_accuracies if acc <= user_metrics.overall_accuracy) / len(all_accuracies) * 100
-        user_percentile_study_time = sum(1 for time in all_study_times if time <= user_metrics.total_study_time) / len(all_study_times) * 100
+        # bisect_right counts the users at or below this user, the percentile's <= semantics
+        user_accuracy = user_metrics.overall_accuracy
+        user_percentile_accuracy = bisect_right(all_accuracies, user_accuracy) / len(all_accuracies) * 100
+        user_percentile_study_time = bisect_right(all_study_times, user_metrics.total_study_time) / len(all_study_times) * 100
         
-        return {
-            "user_accuracy": user_metrics.overall_accuracy,
+        comparison = {
+            "user_accuracy": user_accuracy,
             "system_average_accuracy": avg_accuracy,
             "accuracy_percentile": user_percentile_accuracy,
             "user_study_time": user_metrics.total_study_time,
@@ -268,6 +447,9 @@ class AdvancedAnalytics:
             "study_time_percentile": user_percentile_study_time,
             "rank": f"Top {100 - user_percentile_accuracy:.0f}%" if user_percentile_accuracy > 50 else f"Bottom {user_percentile_accuracy:.0f}%"
         }
+        
+        self._comparative_cache[user_id] = comparison
+        return dict(comparison)
     
     def export_analytics_report(self, user_id: str, file_path: str):
         """Export a comprehensive analytics report to JSON."""
@@ -281,8 +463,7 @@ class AdvancedAnalytics:
             "comparative_analytics": comparative
         }
         
-        with open(file_path, 'w') as f:
-            json.dump(report, f, indent=2)
+        dump_json(report, file_path)
 
 
 class ProgressPredictor:
@@ -315,13 +496,10 @@ class ProgressPredictor:
     def calculate_retention_probability(days_since_last_study: int, 
                                       original_accuracy: float) -> float:
         """Calculate probability of retaining knowledge."""
-        # Based on Ebbinghaus forgetting curve
-        if days_since_last_study <= 0:
-            return original_accuracy / 100.0
-        
-        # Simplified forgetting curve: R(t) = e^(-t/S)
-        # Where S is the stability (higher for better initial performance)
-        stability = original_accuracy / 10.0  # Higher accuracy = better retention
-        retention = math.exp(-days_since_last_study / stability)
-        
-        return max(0.1, retention)  # Minimum 10% retention
+        return _retention_probability(days_since_last_study, original_accuracy)
+    
+    @staticmethod
+    def calculate_retention_probability_batch(days_since_last_study: Iterable[int],
+                                              original_accuracies: Iterable[float]) -> List[float]:
+        """Calculate retention probabilities for paired days and accuracies in one call."""
+        return list(map(_retention_probability, days_since_last_study, original_accuracies))
@@ -3,11 +3,12 @@ Learning paths and curriculum management for structured learning.
 Provides guided learning experiences with prerequisites and milestones.
 """
 
-from typing import Dict, List, Set, Optional, Any
+from typing import Dict, FrozenSet, List, Set, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, timedelta
 import json
+from itertools import islice
 
 
 class PathStatus(Enum):
@@ -27,7 +28,7 @@ class MilestoneType(Enum):
     MASTERY_LEVEL = "mastery_level"
 
 
-@dataclass
+@dataclass(slots=True)
 class Milestone:
     """A learning milestone within a path."""
     id: str
@@ -47,14 +48,14 @@ class Milestone:
         return min(100.0, (self.current_value / self.target_value) * 100)
 
 
-@dataclass
+@dataclass(slots=True)
 class LearningModule:
     """A module within a learning path."""
     id: str
     name: str
     description: str
     tags: List[str] = field(default_factory=list)
-    prerequisites: List[str] = field(default_factory=list)  # Module IDs
+    prerequisites: FrozenSet[str] = frozenset()  # Module IDs
     estimated_duration: int = 30  # minutes
     difficulty_level: int = 1  # 1-5 scale
     questions: List[str] = field(default_factory=list)  # Question IDs
@@ -62,16 +63,50 @@ class LearningModule:
     completed: bool = False
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    # Milestone id -> milestone; the first milestone wins for duplicate ids
+    _milestones_by_id: Dict[str, Milestone] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _summary: Optional[Dict[str, str]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if not isinstance(self.prerequisites, frozenset):
+            self.prerequisites = frozenset(self.prerequisites)
+        for milestone in self.milestones:
+            self._milestones_by_id.setdefault(milestone.id, milestone)
+    
+    def add_milestone(self, milestone: Milestone):
+        """Append a milestone and index it by id."""
+        self.milestones.append(milestone)
+        self._milestones_by_id.setdefault(milestone.id, milestone)
+    
+    def get_milestone(self, milestone_id: str) -> Optional[Milestone]:
+        """Get a milestone by id."""
+        return self._milestones_by_id.get(milestone_id)
+    
+    def summary(self) -> Dict[str, str]:
+        """
+        Get the module's id, name and description for progress listings.
+        
+        The dict is built once and shared between callers, so it must be
+        treated as read-only.
+        """
+        if self._summary is None:
+            self._summary = {"id": self.id, "name": self.name, "description": self.description}
+        return self._summary
     
-    @property
     def is_unlocked(self, completed_modules: Set[str]) -> bool:
         """Check if module is unlocked based on prerequisites."""
-        return all(prereq in completed_modules for prereq in self.prerequisites)
+        return self.prerequisites.issubset(completed_modules)
 
 
-@dataclass
+@dataclass(slots=True)
 class LearningPath:
-    """A structured learning path with modules and milestones."""
+    """
+    A structured learning path with modules and milestones.
+    
+    Progress and status are derived from running counts of started and
+    completed modules. Start and complete modules through start_module() and
+    complete_module() so the counts stay in sync.
+    """
     id: str
     name: str
     description: str
@@ -79,77 +114,134 @@ class LearningPath:
     difficulty_level: int = 1  # 1-5 scale
     estimated_total_duration: int = 0  # minutes
     modules: List[LearningModule] = field(default_factory=list)
-    prerequisites: List[str] = field(default_factory=list)  # Path IDs
+    prerequisites: FrozenSet[str] = frozenset()  # Path IDs
     tags: List[str] = field(default_factory=list)
     created_at: datetime = field(default_factory=datetime.now)
+    # Module id -> module and its position; the first module wins for duplicate ids
+    _modules_by_id: Dict[str, LearningModule] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _module_positions: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # Prerequisite module id -> modules that require it
+    _dependents: Dict[str, List[LearningModule]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # Number of modules that have been started / completed
+    _started_count: int = field(default=0, init=False, repr=False, compare=False)
+    _completed_count: int = field(default=0, init=False, repr=False, compare=False)
+    # Bumped whenever a module is added, so per-user caches can tell they are stale
+    _modules_version: int = field(default=0, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if not isinstance(self.prerequisites, frozenset):
+            self.prerequisites = frozenset(self.prerequisites)
+        for position, module in enumerate(self.modules):
+            self._index_module(module, position)
+    
+    def _index_module(self, module: LearningModule, position: int):
+        """Add a module to the id, position and dependents indexes."""
+        self._modules_by_id.setdefault(module.id, module)
+        self._module_positions.setdefault(module.id, position)
+        for prereq in module.prerequisites:
+            self._dependents.setdefault(prereq, []).append(module)
+        if module.started_at:
+            self._started_count += 1
+        if module.completed:
+            self._completed_count += 1
+    
+    def add_module(self, module: LearningModule):
+        """Append a module and index it by id."""
+        self.modules.append(module)
+        self._index_module(module, len(self.modules) - 1)
+        self._modules_version += 1
+    
+    @property
+    def modules_version(self) -> int:
+        """Number of modules added since the path was created."""
+        return self._modules_version
+    
+    def get_module(self, module_id: str) -> Optional[LearningModule]:
+        """Get a module by id."""
+        return self._modules_by_id.get(module_id)
+    
+    def get_dependents(self, module_id: str) -> List[LearningModule]:
+        """Get the modules that list a module as a prerequisite."""
+        return self._dependents.get(module_id, [])
+    
+    def module_position(self, module_id: str) -> int:
+        """Get the position of a module in the path."""
+        return self._module_positions[module_id]
+    
+    def start_module(self, module: LearningModule, started_at: datetime):
+        """Record that one of the path's modules has been started."""
+        if not module.started_at:
+            self._started_count += 1
+        module.started_at = started_at
+    
+    def complete_module(self, module: LearningModule, completed_at: datetime):
+        """Record that one of the path's modules has been completed."""
+        if not module.completed:
+            self._completed_count += 1
+        module.completed = True
+        module.completed_at = completed_at
     
     @property
     def progress_percentage(self) -> float:
         """Overall progress through the path."""
         if not self.modules:
             return 0.0
-        completed_count = sum(1 for module in self.modules if module.completed)
-        return (completed_count / len(self.modules)) * 100
+        return (self._completed_count / len(self.modules)) * 100
     
     @property
     def status(self) -> PathStatus:
         """Current status of the learning path."""
-        if not any(module.started_at for module in self.modules):
+        if not self._started_count:
             return PathStatus.NOT_STARTED
-        elif all(module.completed for module in self.modules):
+        elif self._completed_count == len(self.modules):
             return PathStatus.COMPLETED
         else:
             return PathStatus.IN_PROGRESS
 
 
+@dataclass(slots=True)
+class UserPathState:
+    """A user's progress on one learning path."""
+    enrolled_at: datetime
+    current_module: Optional[str] = None
+    completed_modules: Set[str] = field(default_factory=set)
+    milestones_completed: Set[str] = field(default_factory=set)
+    # Ids of modules whose prerequisites are completed; computed on first use, extended as modules
+    # complete and recomputed when the path's modules_version no longer matches unlocked_version
+    unlocked_modules: Optional[Set[str]] = None
+    unlocked_version: int = 0
+
+
 class CurriculumManager:
     """Manages learning paths and student progress."""
     
     def __init__(self):
         self.paths: Dict[str, LearningPath] = {}
-        self.user_progress: Dict[str, Dict[str, Any]] = {}  # user_id -> progress data
+        self.user_progress: Dict[Tuple[str, str], UserPathState] = {}  # (user_id, path_id) -> progress
+        self._enrolled_paths: Dict[str, Set[str]] = {}  # user_id -> enrolled path IDs
+        self._beginner_paths: Dict[str, LearningPath] = {}  # paths with difficulty <= 2, in self.paths order
+    
+    def _add_path(self, path: LearningPath):
+        """Store a path and keep the beginner index in step with self.paths."""
+        replacing = path.id in self.paths
+        self.paths[path.id] = path
+        if replacing:
+            # A replaced path keeps its original position, so rebuild to preserve order
+            self._beginner_paths = {
+                path_id: existing for path_id, existing in self.paths.items()
+                if existing.difficulty_level <= 2
+            }
+            # Unlocked modules cached against the old path no longer apply
+            for (_, progress_path_id), progress in self.user_progress.items():
+                if progress_path_id == path.id:
+                    progress.unlocked_modules = None
+        elif path.difficulty_level <= 2:
+            self._beginner_paths[path.id] = path
     
     def create_learning_path(self, path_data: Dict[str, Any]) -> LearningPath:
         """Create a new learning path."""
-        path = LearningPath(
-            id=path_data["id"],
-            name=path_data["name"],
-            description=path_data["description"],
-            category=path_data.get("category", "General"),
-            difficulty_level=path_data.get("difficulty_level", 1),
-            tags=path_data.get("tags", [])
-        )
-        
-        # Add modules
-        for module_data in path_data.get("modules", []):
-            module = LearningModule(
-                id=module_data["id"],
-                name=module_data["name"],
-                description=module_data["description"],
-                tags=module_data.get("tags", []),
-                prerequisites=module_data.get("prerequisites", []),
-                estimated_duration=module_data.get("estimated_duration", 30),
-                difficulty_level=module_data.get("difficulty_level", 1),
-                questions=module_data.get("questions", [])
-            )
-            
-            # Add milestones
-            for milestone_data in module_data.get("milestones", []):
-                milestone = Milestone(
-                    id=milestone_data["id"],
-                    name=milestone_data["name"],
-                    description=milestone_data["description"],
-                    milestone_type=MilestoneType(milestone_data["type"]),
-                    target_value=milestone_data["target_value"]
-                )
-                module.milestones.append(milestone)
-            
-            path.modules.append(module)
-        
-        # Calculate estimated total duration
-        path.estimated_total_duration = sum(module.estimated_duration for module in path.modules)
-        
-        self.paths[path.id] = path
+        path = _build_learning_path(path_data)
+        self._add_path(path)
         return path
     
     def enroll_user(self, user_id: str, path_id: str) -> bool:
@@ -157,83 +249,96 @@ class CurriculumManager:
         if path_id not in self.paths:
             return False
         
-        if user_id not in self.user_progress:
-            self.user_progress[user_id] = {}
-        
-        self.user_progress[user_id][path_id] = {
-            "enrolled_at": datetime.now(),
-            "current_module": None,
-            "completed_modules": set(),
-            "milestones_completed": set()
-        }
+        self._enrolled_paths.setdefault(user_id, set()).add(path_id)
+        self.user_progress[(user_id, path_id)] = UserPathState(enrolled_at=datetime.now())
         
         return True
     
+    def _unlocked_modules(self, path: LearningPath, progress: UserPathState) -> Set[str]:
+        """Get the cached ids of modules whose prerequisites the user has completed."""
+        unlocked = progress.unlocked_modules
+        if unlocked is None or progress.unlocked_version != path.modules_version:
+            completed_modules = progress.completed_modules
+            unlocked = progress.unlocked_modules = {
+                module.id for module in path.modules if module.is_unlocked(completed_modules)
+            }
+            progress.unlocked_version = path.modules_version
+        return unlocked
+    
     def get_next_module(self, user_id: str, path_id: str) -> Optional[LearningModule]:
         """Get the next available module for a user."""
-        if user_id not in self.user_progress or path_id not in self.user_progress[user_id]:
+        progress = self.user_progress.get((user_id, path_id))
+        if progress is None:
             return None
         
         path = self.paths[path_id]
-        completed_modules = self.user_progress[user_id][path_id]["completed_modules"]
-        
-        for module in path.modules:
-            if not module.completed and module.is_unlocked(completed_modules):
-                return module
+        unlocked = self._unlocked_modules(path, progress)
         
-        return None
+        # The earliest unlocked module in path order that is not yet completed
+        available = (module for module in map(path.get_module, unlocked) if not module.completed)
+        return min(available, key=lambda module: path.module_position(module.id), default=None)
     
-    def start_module(self, user_id: str, path_id: str, module_id: str) -> bool:
-        """Start a module for a user."""
-        if user_id not in self.user_progress or path_id not in self.user_progress[user_id]:
+    def start_module(self, user_id: str, path_id: str, module_id: str,
+                     now: Optional[datetime] = None) -> bool:
+        """Start a module for a user, timestamped with now (defaults to the current time)."""
+        progress = self.user_progress.get((user_id, path_id))
+        if progress is None:
             return False
         
         path = self.paths[path_id]
-        module = next((m for m in path.modules if m.id == module_id), None)
+        module = path.get_module(module_id)
         
         if not module or module.completed:
             return False
         
-        completed_modules = self.user_progress[user_id][path_id]["completed_modules"]
-        if not module.is_unlocked(completed_modules):
+        if module.id not in self._unlocked_modules(path, progress):
             return False
         
-        module.started_at = datetime.now()
-        self.user_progress[user_id][path_id]["current_module"] = module_id
+        path.start_module(module, now if now is not None else datetime.now())
+        progress.current_module = module_id
         
         return True
     
-    def complete_module(self, user_id: str, path_id: str, module_id: str) -> bool:
-        """Mark a module as completed."""
-        if user_id not in self.user_progress or path_id not in self.user_progress[user_id]:
+    def complete_module(self, user_id: str, path_id: str, module_id: str,
+                        now: Optional[datetime] = None) -> bool:
+        """Mark a module as completed, timestamped with now (defaults to the current time)."""
+        progress = self.user_progress.get((user_id, path_id))
+        if progress is None:
             return False
         
         path = self.paths[path_id]
-        module = next((m for m in path.modules if m.id == module_id), None)
+        module = path.get_module(module_id)
         
         if not module:
             return False
         
-        module.completed = True
-        module.completed_at = datetime.now()
+        path.complete_module(module, now if now is not None else datetime.now())
         
-        self.user_progress[user_id][path_id]["completed_modules"].add(module_id)
-        self.user_progress[user_id][path_id]["current_module"] = None
+        progress.completed_modules.add(module_id)
+        progress.current_module = None
+        
+        # Only modules that depend on this one can have become unlocked
+        unlocked = progress.unlocked_modules
+        if unlocked is not None and progress.unlocked_version == path.modules_version:
+            for dependent in path.get_dependents(module_id):
+                if dependent.is_unlocked(progress.completed_modules):
+                    unlocked.add(dependent.id)
         
         return True
     
     def update_milestone_progress(self, user_id: str, path_id: str, module_id: str, 
-                                milestone_id: str, value: float) -> bool:
-        """Update progress on a milestone."""
+                                milestone_id: str, value: float,
+                                now: Optional[datetime] = None) -> bool:
+        """Update progress on a milestone, timestamping completion with now (defaults to the current time)."""
         path = self.paths.get(path_id)
         if not path:
             return False
         
-        module = next((m for m in path.modules if m.id == module_id), None)
+        module = path.get_module(module_id)
         if not module:
             return False
         
-        milestone = next((m for m in module.milestones if m.id == milestone_id), None)
+        milestone = module.get_milestone(milestone_id)
         if not milestone:
             return False
         
@@ -242,40 +347,40 @@ class CurriculumManager:
         # Check if milestone is completed
         if milestone.current_value >= milestone.target_value and not milestone.completed:
             milestone.completed = True
-            milestone.completed_at = datetime.now()
+            milestone.completed_at = now if now is not None else datetime.now()
             
             # Add to user's completed milestones
-            if user_id in self.user_progress and path_id in self.user_progress[user_id]:
-                self.user_progress[user_id][path_id]["milestones_completed"].add(milestone_id)
+            progress = self.user_progress.get((user_id, path_id))
+            if progress is not None:
+                progress.milestones_completed.add(milestone_id)
         
         return True
     
     def get_user_progress(self, user_id: str, path_id: str) -> Dict[str, Any]:
         """Get detailed progress for a user on a path."""
-        if user_id not in self.user_progress or path_id not in self.user_progress[user_id]:
+        user_data = self.user_progress.get((user_id, path_id))
+        if user_data is None:
             return {"error": "User not enrolled in path"}
         
         path = self.paths[path_id]
-        user_data = self.user_progress[user_id][path_id]
         
         # Calculate overall progress
-        completed_modules = len(user_data["completed_modules"])
+        completed_modules = len(user_data.completed_modules)
         total_modules = len(path.modules)
         
+        unlocked = self._unlocked_modules(path, user_data)
+        
         # Get current module details
         current_module = None
-        if user_data["current_module"]:
-            current_module = next(
-                (m for m in path.modules if m.id == user_data["current_module"]), 
-                None
-            )
+        if user_data.current_module:
+            current_module = path.get_module(user_data.current_module)
         
         # Calculate time spent and estimated remaining
         time_spent = 0
         estimated_remaining = 0
         
         for module in path.modules:
-            if module.id in user_data["completed_modules"]:
+            if module.id in user_data.completed_modules:
                 time_spent += module.estimated_duration
             else:
                 estimated_remaining += module.estimated_duration
@@ -283,7 +388,7 @@ class CurriculumManager:
         return {
             "path_id": path_id,
             "path_name": path.name,
-            "enrolled_at": user_data["enrolled_at"],
+            "enrolled_at": user_data.enrolled_at,
             "status": path.status.value,
             "progress_percentage": path.progress_percentage,
             "completed_modules": completed_modules,
@@ -291,17 +396,17 @@ class CurriculumManager:
             "current_module": current_module.name if current_module else None,
             "time_spent_minutes": time_spent,
             "estimated_remaining_minutes": estimated_remaining,
-            "milestones_completed": len(user_data["milestones_completed"]),
+            "milestones_completed": len(user_data.milestones_completed),
             "next_available_modules": [
-                {"id": m.id, "name": m.name, "description": m.description}
-                for m in path.modules 
-                if not m.completed and m.is_unlocked(user_data["completed_modules"])
+                module.summary()
+                for module in sorted(map(path.get_module, unlocked), key=lambda m: path.module_position(m.id))
+                if not module.completed
             ]
         }
     
     def get_recommendations(self, user_id: str) -> List[Dict[str, Any]]:
         """Get personalized path recommendations for a user."""
-        if user_id not in self.user_progress:
+        if user_id not in self._enrolled_paths:
             # New user - recommend beginner paths
             return [
                 {
@@ -312,16 +417,15 @@ class CurriculumManager:
                     "difficulty": path.difficulty_level,
                     "estimated_duration": path.estimated_total_duration
                 }
-                for path in self.paths.values()
-                if path.difficulty_level <= 2
-            ][:3]
-        
-        # Get user's completed paths and current interests
-        user_data = self.user_progress[user_id]
-        completed_paths = {
-            path_id for path_id, progress in user_data.items()
-            if self.paths[path_id].status == PathStatus.COMPLETED
-        }
+                for path in islice(self._beginner_paths.values(), 3)
+            ]
+        
+        # A prerequisite is met by an enrolled path that is completed; path
+        # status is O(1), so each prerequisite is checked directly
+        user_data = self._enrolled_paths[user_id]
+        
+        def is_completed(path_id: str) -> bool:
+            return path_id in user_data and self.paths[path_id].status == PathStatus.COMPLETED
         
         recommendations = []
         
@@ -329,10 +433,10 @@ class CurriculumManager:
         for path in self.paths.values():
             if path.id not in user_data:  # Not enrolled
                 # Check if prerequisites are met
-                if all(prereq in completed_paths for prereq in path.prerequisites):
+                if all(map(is_completed, path.prerequisites)):
                     reason = "Next step in your learning journey"
                     if path.prerequisites:
-                        reason = f"Builds on {', '.join(path.prerequisites)}"
+                        reason = f"Builds on {', '.join(sorted(path.prerequisites))}"
                     
                     recommendations.append({
                         "path_id": path.id,
@@ -386,57 +490,106 @@ class CurriculumManager:
                 target_value=10
             )
             
-            module.milestones.extend([accuracy_milestone, streak_milestone])
-            path.modules.append(module)
+            module.add_milestone(accuracy_milestone)
+            module.add_milestone(streak_milestone)
+            path.add_module(module)
         
         path.estimated_total_duration = sum(m.estimated_duration for m in path.modules)
-        self.paths[path.id] = path
+        self._add_path(path)
         
         return path
     
     def export_curriculum(self, file_path: str):
-        """Export curriculum data to JSON."""
-        curriculum_data = {
-            "paths": {
-                path_id: {
-                    "id": path.id,
-                    "name": path.name,
-                    "description": path.description,
-                    "category": path.category,
-                    "difficulty_level": path.difficulty_level,
-                    "estimated_total_duration": path.estimated_total_duration,
-                    "modules": [
+        """Export curriculum data to JSON, writing one path at a time."""
+        with open(file_path, 'w') as f:
+            f.write('{\n  "paths": {')
+            separator = '\n'
+            for path_id, path in self.paths.items():
+                # Each path is serialized on its own and nested two levels deep
+                path_json = json.dumps(self._path_to_dict(path), indent=2).replace('\n', '\n    ')
+                f.write(f'{separator}    {json.dumps(path_id)}: {path_json}')
+                separator = ',\n'
+            f.write('\n  },' if self.paths else '},')
+            f.write(f'\n  "exported_at": {json.dumps(datetime.now().isoformat())}\n}}')
+    
+    @staticmethod
+    def _path_to_dict(path: LearningPath) -> Dict[str, Any]:
+        """Build the export representation of a learning path."""
+        return {
+            "id": path.id,
+            "name": path.name,
+            "description": path.description,
+            "category": path.category,
+            "difficulty_level": path.difficulty_level,
+            "estimated_total_duration": path.estimated_total_duration,
+            "modules": [
+                {
+                    "id": module.id,
+                    "name": module.name,
+                    "description": module.description,
+                    "tags": module.tags,
+                    "prerequisites": sorted(module.prerequisites),
+                    "estimated_duration": module.estimated_duration,
+                    "difficulty_level": module.difficulty_level,
+                    "milestones": [
                         {
-                            "id": module.id,
-                            "name": module.name,
-                            "description": module.description,
-                            "tags": module.tags,
-                            "prerequisites": module.prerequisites,
-                            "estimated_duration": module.estimated_duration,
-                            "difficulty_level": module.difficulty_level,
-                            "milestones": [
-                                {
-                                    "id": milestone.id,
-                                    "name": milestone.name,
-                                    "description": milestone.description,
-                                    "type": milestone.milestone_type.value,
-                                    "target_value": milestone.target_value
-                                }
-                                for milestone in module.milestones
-                            ]
+                            "id": milestone.id,
+                            "name": milestone.name,
+                            "description": milestone.description,
+                            "type": milestone.milestone_type.value,
+                            "target_value": milestone.target_value
                         }
-                        for module in path.modules
-                    ],
-                    "prerequisites": path.prerequisites,
-                    "tags": path.tags
+                        for milestone in module.milestones
+                    ]
                 }
-                for path_id, path in self.paths.items()
-            },
-            "exported_at": datetime.now().isoformat()
+                for module in path.modules
+            ],
+            "prerequisites": sorted(path.prerequisites),
+            "tags": path.tags
         }
+
+
+def _build_learning_path(path_data: Dict[str, Any]) -> LearningPath:
+    """Build a learning path with its modules and milestones from a dict."""
+    path = LearningPath(
+        id=path_data["id"],
+        name=path_data["name"],
+        description=path_data["description"],
+        category=path_data.get("category", "General"),
+        difficulty_level=path_data.get("difficulty_level", 1),
+        tags=path_data.get("tags", [])
+    )
+    
+    # Add modules
+    for module_data in path_data.get("modules", []):
+        module = LearningModule(
+            id=module_data["id"],
+            name=module_data["name"],
+            description=module_data["description"],
+            tags=module_data.get("tags", []),
+            prerequisites=frozenset(module_data.get("prerequisites", ())),
+            estimated_duration=module_data.get("estimated_duration", 30),
+            difficulty_level=module_data.get("difficulty_level", 1),
+            questions=module_data.get("questions", [])
+        )
         
-        with open(file_path, 'w') as f:
-            json.dump(curriculum_data, f, indent=2)
+        # Add milestones
+        for milestone_data in module_data.get("milestones", []):
+            milestone = Milestone(
+                id=milestone_data["id"],
+                name=milestone_data["name"],
+                description=milestone_data["description"],
+                milestone_type=MilestoneType(milestone_data["type"]),
+                target_value=milestone_data["target_value"]
+            )
+            module.add_milestone(milestone)
+        
+        path.add_module(module)
+    
+    # Calculate estimated total duration
+    path.estimated_total_duration = sum(module.estimated_duration for module in path.modules)
+    
+    return path
 
 
 # Predefined curriculum templates
@@ -2,17 +2,32 @@
 ELO rating system for measuring question difficulty and user performance.
 """
 
+import heapq
 import math
-from typing import Tuple
+from bisect import bisect_right
+from math import exp
+from typing import Iterable, List, Optional, Tuple
 from .models import Question, AnswerResult
 
 
+# Difficulty categories: DIFFICULTY_LABELS[i] covers ratings below DIFFICULTY_THRESHOLDS[i]
+DIFFICULTY_THRESHOLDS = (1000, 1200, 1400, 1600, 1800)
+DIFFICULTY_LABELS = ("Very Easy", "Easy", "Medium", "Hard", "Very Hard", "Expert")
+
+# User skill levels: USER_LEVEL_LABELS[i] covers ratings below USER_LEVEL_THRESHOLDS[i]
+USER_LEVEL_THRESHOLDS = (1000, 1200, 1400, 1600, 1800)
+USER_LEVEL_LABELS = ("Beginner", "Novice", "Intermediate", "Advanced", "Expert", "Master")
+
+
 class ELORatingSystem:
     """
     ELO rating system for questions and users.
     Questions start with a rating of 1200, and the rating changes based on how often users answer correctly.
     """
     
+    # 10 ** (d / 400) == exp(d * ln(10) / 400); math.exp is cheaper than math.pow
+    _LN10_OVER_400 = math.log(10) / 400.0
+    
     def __init__(self, k_factor: float = 32, initial_rating: float = 1200):
         """
         Initialize the ELO rating system.
@@ -35,7 +50,21 @@ class ELORatingSystem:
         Returns:
             Expected score (0.0 to 1.0) for player A
         """
-        return 1 / (1 + math.pow(10, (rating_b - rating_a) / 400))
+        return 1 / (1 + exp((rating_b - rating_a) * self._LN10_OVER_400))
+    
+    def expected_scores(self, rating_a: float, ratings_b: Iterable[float]) -> List[float]:
+        """
+        Calculate expected scores for player A against many opponents in one pass.
+        
+        Args:
+            rating_a: Rating of player A
+            ratings_b: Ratings of the opponents
+            
+        Returns:
+            Expected scores (0.0 to 1.0) for player A, in opponent order
+        """
+        scale = self._LN10_OVER_400
+        return [1 / (1 + exp((rating_b - rating_a) * scale)) for rating_b in ratings_b]
     
     def update_ratings(self, question_rating: float, user_rating: float, 
                       result: AnswerResult) -> Tuple[float, float]:
@@ -54,9 +83,9 @@ class ELORatingSystem:
             # No rating change for skipped questions
             return question_rating, user_rating
         
-        # Calculate expected scores
+        # Calculate expected scores (they always sum to 1)
         user_expected = self.expected_score(user_rating, question_rating)
-        question_expected = self.expected_score(question_rating, user_rating)
+        question_expected = 1.0 - user_expected
         
         # Determine actual scores based on result
         if result == AnswerResult.CORRECT:
@@ -67,8 +96,9 @@ class ELORatingSystem:
             question_actual = 1.0  # Question beat the user
         
         # Update ratings using ELO formula
-        new_user_rating = user_rating + self.k_factor * (user_actual - user_expected)
-        new_question_rating = question_rating + self.k_factor * (question_actual - question_expected)
+        k_factor = self.k_factor
+        new_user_rating = user_rating + k_factor * (user_actual - user_expected)
+        new_question_rating = question_rating + k_factor * (question_actual - question_expected)
         
         return new_question_rating, new_user_rating
     
@@ -103,18 +133,7 @@ class ELORatingSystem:
         Returns:
             String describing the difficulty level
         """
-        if rating < 1000:
-            return "Very Easy"
-        elif rating < 1200:
-            return "Easy" 
-        elif rating < 1400:
-            return "Medium"
-        elif rating < 1600:
-            return "Hard"
-        elif rating < 1800:
-            return "Very Hard"
-        else:
-            return "Expert"
+        return DIFFICULTY_LABELS[bisect_right(DIFFICULTY_THRESHOLDS, rating)]
     
     def get_user_level(self, rating: float) -> str:
         """
@@ -126,18 +145,7 @@ class ELORatingSystem:
         Returns:
             String describing the user's skill level
         """
-        if rating < 1000:
-            return "Beginner"
-        elif rating < 1200:
-            return "Novice"
-        elif rating < 1400:
-            return "Intermediate"
-        elif rating < 1600:
-            return "Advanced"
-        elif rating < 1800:
-            return "Expert"
-        else:
-            return "Master"
+        return USER_LEVEL_LABELS[bisect_right(USER_LEVEL_THRESHOLDS, rating)]
     
     def predict_success_probability(self, user_rating: float, question_rating: float) -> float:
         """
@@ -188,6 +196,9 @@ class UserRatingTracker:
             Tuple of (new_user_rating, new_question_rating)
         """
         current_user_rating = self.get_user_rating(user_id)
+        if result == AnswerResult.SKIPPED:
+            # Skips leave both ratings unchanged
+            return current_user_rating, question.elo_rating
         
         new_question_rating, new_user_rating = self.elo_system.update_ratings(
             question.elo_rating, current_user_rating, result
@@ -199,38 +210,67 @@ class UserRatingTracker:
         
         return new_user_rating, new_question_rating
     
+    def update_user_ratings(self, user_id: str,
+                            answers: Iterable[Tuple[Question, AnswerResult]]) -> List[Tuple[float, float]]:
+        """
+        Apply a sequence of answer results for one user, e.g. when replaying a session.
+        
+        Equivalent to calling update_user_rating for each answer in order, with
+        the user's rating kept in a local and written back once.
+        
+        Args:
+            user_id: Identifier for the user
+            answers: Iterable of (question, result) pairs, in the order answered
+            
+        Returns:
+            List of (new_user_rating, new_question_rating) tuples, one per answer
+        """
+        user_rating = self.get_user_rating(user_id)
+        update_ratings = self.elo_system.update_ratings
+        
+        ratings = []
+        try:
+            for question, result in answers:
+                question.elo_rating, user_rating = update_ratings(question.elo_rating, user_rating, result)
+                ratings.append((user_rating, question.elo_rating))
+        finally:
+            self.ratings[user_id] = user_rating
+        
+        return ratings
+    
     def get_user_level(self, user_id: str) -> str:
         """Get human-readable skill level for a user."""
         rating = self.get_user_rating(user_id)
         return self.elo_system.get_user_level(rating)
     
-    def get_recommended_questions(self, user_id: str, questions: list, 
-                                target_success_rate: float = 0.7) -> list:
+    def get_recommended_questions(self, user_id: str, questions: Iterable[Question], 
+                                target_success_rate: float = 0.7,
+                                limit: Optional[int] = None) -> List[Question]:
         """
         Get questions recommended for a user based on their skill level.
         
         Args:
             user_id: The user identifier
-            questions: List of available questions
+            questions: Available questions (any iterable, e.g. a dict values view)
             target_success_rate: Desired probability of success (0.5-0.9)
+            limit: Only return this many of the best matches, selected without a full sort
             
         Returns:
             List of questions sorted by appropriateness for the user
         """
         user_rating = self.get_user_rating(user_id)
+        questions = list(questions)
         
-        # Calculate success probability for each question
-        question_scores = []
-        for question in questions:
-            success_prob = self.elo_system.predict_success_probability(
-                user_rating, question.elo_rating
-            )
-            
-            # Score based on how close to target success rate
-            score = 1 - abs(success_prob - target_success_rate)
-            question_scores.append((question, score, success_prob))
+        # Success probability for every question at once, scored by closeness to the target rate
+        success_probs = self.elo_system.expected_scores(
+            user_rating, [question.elo_rating for question in questions]
+        )
+        scores = [1 - abs(success_prob - target_success_rate) for success_prob in success_probs]
         
-        # Sort by score (best matches first)
-        question_scores.sort(key=lambda x: x[1], reverse=True)
+        # Order question positions by score (best matches first, ties keep their order)
+        if limit is not None and limit < len(questions):
+            order = heapq.nlargest(limit, range(len(questions)), key=scores.__getitem__)
+        else:
+            order = sorted(range(len(questions)), key=scores.__getitem__, reverse=True)
         
-        return [q[0] for q in question_scores]
+        return [questions[index] for index in order]
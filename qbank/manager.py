@@ -3,13 +3,16 @@ Main interface for the Question Bank system.
 Provides a high-level API for managing questions, study sessions, and spaced repetition.
 """
 
+from bisect import bisect_right
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Optional, Dict, Set
+from typing import List, Optional, Dict, Set, Iterable, Tuple
+import heapq
 import random
 
 from .models import Question, Answer, QuestionBank, StudySession, AnswerResult
 from .spaced_repetition import SpacedRepetitionScheduler
-from .elo_rating import ELORatingSystem, UserRatingTracker
+from .elo_rating import ELORatingSystem, UserRatingTracker, DIFFICULTY_LABELS, DIFFICULTY_THRESHOLDS
 
 
 class QuestionBankManager:
@@ -31,6 +34,28 @@ class QuestionBankManager:
         self.user_tracker = UserRatingTracker()
         self.current_user_id = user_id
         self.current_session: Optional[StudySession] = None
+        self._breakdown_cache: Optional[Dict] = None
+        self._forecast_cache: Dict[tuple, Dict] = {}
+        self._dirty = False
+    
+    @property
+    def dirty(self) -> bool:
+        """Whether the bank has changed since it was last imported or marked saved."""
+        return self._dirty
+    
+    def mark_saved(self) -> None:
+        """Record that the bank has been written to its own file, clearing dirty."""
+        self._dirty = False
+    
+    def _invalidate_caches(self) -> None:
+        """Drop cached aggregates after the bank or question stats change."""
+        self._breakdown_cache = None
+        self._forecast_cache.clear()
+    
+    def _mark_changed(self) -> None:
+        """Flag the bank as modified and drop cached aggregates."""
+        self._dirty = True
+        self._invalidate_caches()
     
     # Question Management
     def add_question(self, question_text: str, correct_answer: str, 
@@ -51,6 +76,19 @@ class QuestionBankManager:
         Returns:
             The created Question object
         """
+        question = self._build_question(
+            question_text, correct_answer, incorrect_answers, tags, objective, explanations
+        )
+        self.question_bank.add_question(question)
+        self._mark_changed()
+        return question
+    
+    @staticmethod
+    def _build_question(question_text: str, correct_answer: str,
+                        incorrect_answers: List[str], tags: Optional[Set[str]] = None,
+                        objective: Optional[str] = None,
+                        explanations: Optional[Dict[str, str]] = None) -> Question:
+        """Construct a Question and its answers without adding it to the bank."""
         if explanations is None:
             explanations = {}
         
@@ -77,17 +115,19 @@ class QuestionBankManager:
         # Create question
         question = Question(
             question_text=question_text,
-            answers=answers,
+            answers=tuple(answers),
             objective=objective,
             tags=tags or set()
         )
         
-        self.question_bank.add_question(question)
         return question
     
     def remove_question(self, question_id: str) -> bool:
         """Remove a question from the bank."""
-        return self.question_bank.remove_question(question_id)
+        removed = self.question_bank.remove_question(question_id)
+        if removed:
+            self._mark_changed()
+        return removed
     
     def get_question(self, question_id: str) -> Optional[Question]:
         """Get a question by ID."""
@@ -97,6 +137,20 @@ class QuestionBankManager:
         """Search questions by text content."""
         return self.question_bank.search_questions(query)
     
+    def tag_question(self, question_id: str, tag: str) -> bool:
+        """Add a tag to a question, keeping the bank's tag index current."""
+        tagged = self.question_bank.tag_question(question_id, tag)
+        if tagged:
+            self._mark_changed()
+        return tagged
+    
+    def untag_question(self, question_id: str, tag: str) -> bool:
+        """Remove a tag from a question, keeping the bank's tag index current."""
+        untagged = self.question_bank.untag_question(question_id, tag)
+        if untagged:
+            self._mark_changed()
+        return untagged
+    
     def get_questions_by_tag(self, tag: str) -> List[Question]:
         """Get all questions with a specific tag."""
         return self.question_bank.get_questions_by_tag(tag)
@@ -105,6 +159,10 @@ class QuestionBankManager:
         """Get all unique tags across all questions."""
         return self.question_bank.get_all_tags()
     
+    def get_tag_counts(self) -> Dict[str, int]:
+        """Get the number of questions carrying each tag."""
+        return self.question_bank.get_tag_counts()
+    
     # Study Session Management
     def start_study_session(self, max_questions: Optional[int] = None,
                           tags_filter: Optional[Set[str]] = None,
@@ -140,15 +198,12 @@ class QuestionBankManager:
                 if min_elo <= q.elo_rating <= max_elo
             ]
         
-        # Get user's skill level for better question selection
+        # Get user's skill level for better question selection, keeping only the
+        # best max_questions matches if a limit is specified
         recommended_questions = self.user_tracker.get_recommended_questions(
-            self.current_user_id, due_questions
+            self.current_user_id, due_questions, limit=max_questions or None
         )
         
-        # Limit number of questions if specified
-        if max_questions and len(recommended_questions) > max_questions:
-            recommended_questions = recommended_questions[:max_questions]
-        
         # Shuffle to avoid predictable order
         random.shuffle(recommended_questions)
         
@@ -176,27 +231,62 @@ class QuestionBankManager:
         if self.current_session is None:
             raise RuntimeError("No study session in progress.")
         
+        question, selected_answer = self._resolve_answer(question_id, selected_answer_id)
+        result = self._apply_answer(question, selected_answer, response_time, datetime.now())
+        self._mark_changed()
+        return result
+    
+    def bulk_answer_questions(self, answers: Iterable[Tuple[str, str, Optional[float]]]) -> List[Dict]:
+        """
+        Submit several answers for the current study session at once.
+        
+        Every answer is validated before any is applied, and all of them share
+        a single review timestamp.
+        
+        Args:
+            answers: Iterable of (question_id, selected_answer_id, response_time) tuples
+            
+        Returns:
+            List of result dictionaries, in the same order as answer_question returns them
+        """
+        if self.current_session is None:
+            raise RuntimeError("No study session in progress.")
+        
+        resolve = self._resolve_answer
+        resolved = [
+            (*resolve(question_id, selected_answer_id), response_time)
+            for question_id, selected_answer_id, response_time in answers
+        ]
+        
+        apply = self._apply_answer
+        current_time = datetime.now()
+        results = [
+            apply(question, selected_answer, response_time, current_time)
+            for question, selected_answer, response_time in resolved
+        ]
+        if results:
+            self._mark_changed()
+        return results
+    
+    def _resolve_answer(self, question_id: str, selected_answer_id: str) -> Tuple[Question, Answer]:
+        """Look up a question and one of its answers, raising ValueError if either is missing."""
         question = self.get_question(question_id)
         if not question:
             raise ValueError(f"Question {question_id} not found.")
         
-        # Find the selected answer
-        selected_answer = None
-        for answer in question.answers:
-            if answer.id == selected_answer_id:
-                selected_answer = answer
-                break
-        
-        if not selected_answer:
+        answer = question.get_answer(selected_answer_id)
+        if answer is None:
             raise ValueError(f"Answer {selected_answer_id} not found.")
-        
+        return question, answer
+    
+    def _apply_answer(self, question: Question, selected_answer: Answer,
+                     response_time: Optional[float], current_time: datetime) -> Dict:
+        """Update statistics, ratings and schedule for an answered question and record it."""
         # Determine result
         result = AnswerResult.CORRECT if selected_answer.is_correct else AnswerResult.INCORRECT
         
         # Update question statistics
-        question.times_answered += 1
-        if result == AnswerResult.CORRECT:
-            question.times_correct += 1
+        question.record_answer(result == AnswerResult.CORRECT)
         
         # Update ELO ratings
         user_rating, question_rating = self.user_tracker.update_user_rating(
@@ -205,11 +295,12 @@ class QuestionBankManager:
         
         # Schedule next review using spaced repetition
         next_review = self.scheduler.schedule_next_review(
-            question, result, response_time
+            question, result, response_time, current_time
         )
+        self.question_bank.reschedule(question)
         
         # Record result in current session
-        self.current_session.results[question_id] = result
+        self.current_session.record_result(question.id, result)
         
         return {
             "correct": result == AnswerResult.CORRECT,
@@ -233,9 +324,11 @@ class QuestionBankManager:
         
         # Schedule next review for skipped question
         self.scheduler.schedule_next_review(question, AnswerResult.SKIPPED)
+        self.question_bank.reschedule(question)
+        self._mark_changed()
         
         # Record skip in current session
-        self.current_session.results[question_id] = AnswerResult.SKIPPED
+        self.current_session.record_result(question_id, AnswerResult.SKIPPED)
     
     def end_study_session(self) -> StudySession:
         """End the current study session and return session statistics."""
@@ -247,6 +340,7 @@ class QuestionBankManager:
         
         # Add to question bank history
         self.question_bank.study_sessions.append(completed_session)
+        self._dirty = True
         
         # Clear current session
         self.current_session = None
@@ -269,49 +363,107 @@ class QuestionBankManager:
             avg_accuracy = 0.0
             total_questions_answered = 0
         
-        # Questions due for review
-        due_questions = self.question_bank.get_questions_due_for_review()
-        
         return {
             "user_rating": user_rating,
             "user_level": user_level,
             "total_sessions": total_sessions,
             "recent_accuracy": avg_accuracy,
             "total_questions_answered": total_questions_answered,
-            "questions_due": len(due_questions),
+            "questions_due": self.question_bank.count_questions_due(),
             "total_questions": len(self.question_bank.questions)
         }
     
+    def get_performance_breakdown(self) -> Dict:
+        """
+        Get per-subject performance and the difficulty distribution.
+        
+        All aggregates are built in a single pass over the bank and cached
+        until the next change made through the manager.
+        
+        Returns:
+            Dictionary with "subjects" (tag -> (correct, answered)) and
+            "accuracies" (tag -> list of per-question accuracies) for answered
+            questions, and "difficulty" (label -> question count)
+        """
+        if self._breakdown_cache is None:
+            subjects = defaultdict(lambda: [0, 0])  # tag -> [correct, answered]
+            accuracies = defaultdict(list)
+            difficulties = [0] * len(DIFFICULTY_LABELS)
+            for question in self.question_bank.questions.values():
+                difficulties[bisect_right(DIFFICULTY_THRESHOLDS, question.elo_rating)] += 1
+                if question.times_answered:
+                    accuracy = question.accuracy
+                    for tag in question.tags:
+                        data = subjects[tag]
+                        data[0] += question.times_correct
+                        data[1] += question.times_answered
+                        accuracies[tag].append(accuracy)
+            self._breakdown_cache = {
+                "subjects": {tag: tuple(data) for tag, data in subjects.items()},
+                "accuracies": dict(accuracies),
+                "difficulty": dict(zip(DIFFICULTY_LABELS, difficulties))
+            }
+        # Callers get their own copy so changes to it never reach the cache
+        cached = self._breakdown_cache
+        return {
+            "subjects": dict(cached["subjects"]),
+            "accuracies": {tag: list(values) for tag, values in cached["accuracies"].items()},
+            "difficulty": dict(cached["difficulty"])
+        }
+    
     def get_review_forecast(self, days: int = 7) -> Dict:
-        """Get forecast of questions due for review in the coming days."""
-        all_questions = list(self.question_bank.questions.values())
-        return self.scheduler.get_review_forecast(all_questions, days)
+        """
+        Get forecast of questions due for review in the coming days.
+        
+        The forecast is cached like the performance breakdown: it is dropped on
+        every change made through the manager, and it also follows the bank's
+        review index version, so schedule changes made on the bank must go
+        through QuestionBank.reschedule() to be seen.
+        """
+        # Reusable until the review schedule changes or the day rolls over
+        key = (self.question_bank.version, days, datetime.now().date())
+        forecast = self._forecast_cache.get(key)
+        if forecast is None:
+            forecast = self.scheduler.get_review_forecast(self.question_bank.questions.values(), days)
+            self._forecast_cache[key] = forecast
+        return dict(forecast)
     
     def get_difficult_questions(self, limit: int = 10) -> List[Question]:
         """Get the most difficult questions based on ELO rating and accuracy."""
-        questions = list(self.question_bank.questions.values())
-        
         # Filter questions that have been answered at least once
-        answered_questions = [q for q in questions if q.times_answered > 0]
+        answered_questions = (q for q in self.question_bank.questions.values() if q.times_answered > 0)
         
-        # Sort by difficulty (low accuracy and high ELO rating = difficult)
-        answered_questions.sort(key=lambda q: (q.accuracy, -q.elo_rating))
-        
-        return answered_questions[:limit]
+        # Select the top by difficulty (low accuracy and high ELO rating = difficult) without a full sort
+        return heapq.nsmallest(limit, answered_questions, key=lambda q: (q.accuracy, -q.elo_rating))
     
     def suggest_study_session_size(self, target_minutes: int = 30) -> int:
         """Suggest optimal number of questions for a study session."""
         due_questions = self.question_bank.get_questions_due_for_review()
         return self.scheduler.suggest_study_session_size(due_questions, target_minutes)
     
+    def reset_progress(self) -> None:
+        """Reset the current user's rating and every question's statistics and schedule."""
+        self.user_tracker.ratings.pop(self.current_user_id, None)
+        for question in self.question_bank.questions.values():
+            question.reset_progress()
+        self.question_bank.rebuild_review_index()
+        self._mark_changed()
+    
     # Import/Export
     def export_bank(self, filepath: str) -> None:
-        """Export the question bank to a JSON file."""
+        """
+        Export the question bank to a JSON file.
+        
+        Exporting does not clear dirty, since the file may be a copy elsewhere;
+        call mark_saved() after writing the bank's own file.
+        """
         self.question_bank.export_to_json(filepath)
     
     def import_bank(self, filepath: str) -> None:
         """Import a question bank from a JSON file."""
         self.question_bank = QuestionBank.import_from_json(filepath)
+        self._invalidate_caches()
+        self._dirty = False
     
     # Convenience Methods
     def create_multiple_choice_question(self, question_text: str, 
@@ -337,28 +489,46 @@ class QuestionBankManager:
             question_text, correct_answer, wrong_answers, tag_set, objective
         )
     
-    def bulk_add_questions(self, questions_data: List[Dict]) -> List[Question]:
+    def bulk_add_questions(self, questions_data: Iterable[Dict]) -> List[Question]:
         """
         Add multiple questions at once.
         
         Args:
-            questions_data: List of dictionaries with question data.
+            questions_data: Iterable of dictionaries with question data.
                           Each dict should have: question, correct_answer,
                           wrong_answers, tags (optional), objective (optional)
                           
         Returns:
             List of created Question objects
         """
-        created_questions = []
-        
-        for q_data in questions_data:
-            question = self.create_multiple_choice_question(
-                question_text=q_data["question"],
-                correct_answer=q_data["correct_answer"],
-                wrong_answers=q_data["wrong_answers"],
-                tags=q_data.get("tags", []),
-                objective=q_data.get("objective")
-            )
-            created_questions.append(question)
+        return self.bulk_create_multiple_choice_questions(
+            (q_data["question"], q_data["correct_answer"], q_data["wrong_answers"],
+             q_data.get("tags", []), q_data.get("objective"))
+            for q_data in questions_data
+        )
+    
+    def bulk_create_multiple_choice_questions(self, rows: Iterable[tuple]) -> List[Question]:
+        """
+        Create multiple choice questions from a stream of rows.
         
-        return created_questions
+        Questions are constructed directly and inserted into the bank in a
+        single pass once the stream is exhausted.
+        
+        Args:
+            rows: Iterable of (question_text, correct_answer, wrong_answers,
+                  tags, objective) tuples. Generators are consumed lazily.
+                  
+        Returns:
+            List of created Question objects
+        """
+        build = self._build_question
+        created_questions = [
+            build(question_text, correct_answer, wrong_answers,
+                  set(tags) if tags else set(), objective)
+            for question_text, correct_answer, wrong_answers, tags, objective in rows
+        ]
+        
+        if created_questions:
+            self.question_bank.add_questions(created_questions)
+            self._mark_changed()
+        return created_questions
\ No newline at end of file
@@ -2,12 +2,52 @@
 Core data models for the question bank system.
 """
 
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, OrderedDict
 from dataclasses import dataclass, field
-from typing import List, Dict, Set, Optional
+from typing import Iterable, List, Dict, Set, Optional, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
-import uuid
-import json
+import heapq
+import itertools
+import math
+import os
+import re
+import secrets
+
+from ._cache import dump_json, load_bank_data
+
+
+BANK_FORMAT_VERSION = 1  # Written by export_to_json; files carrying it are loaded via the trusted fast path
+SEARCH_CACHE_SIZE = 64  # Number of distinct search queries kept in QuestionBank's LRU cache
+SEARCH_FIELD_SEPARATOR = "\x1f"  # Joins a question's searchable texts so one substring test covers them all
+_TOKEN_RE = re.compile(r"\w+")
+
+
+# Ids are a random per-process prefix followed by a counter; the prefix is
+# redrawn in forked children so parent and child never hand out the same id
+_ID_PREFIX = secrets.token_hex(8)
+_id_counter = itertools.count()
+
+
+def _new_id() -> str:
+    """New id: unique within the process, and across processes through the random prefix"""
+    return f"{_ID_PREFIX}{next(_id_counter):012x}"
+
+
+def _reset_id_prefix() -> None:
+    """Draw a fresh id prefix, e.g. in a forked child"""
+    global _ID_PREFIX
+    _ID_PREFIX = secrets.token_hex(8)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_id_prefix)
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    """ISO 8601 string for an optional datetime"""
+    return value.isoformat() if value is not None else None
 
 
 class Difficulty(Enum):
@@ -25,20 +65,25 @@ class AnswerResult(Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+@dataclass(slots=True)
 class Answer:
     """Represents a single answer option for a question"""
     text: str
     is_correct: bool
     explanation: Optional[str] = None
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
 
 
-@dataclass
+@dataclass(slots=True)
 class Question:
-    """Represents a single question with multiple choice answers"""
+    """
+    Represents a single question with multiple choice answers
+    
+    get_answer() indexes the answers on first use, so answers should not be
+    replaced afterwards.
+    """
     question_text: str
-    answers: List[Answer]
+    answers: Tuple[Answer, ...]  # Immutable; lists passed in are converted
     objective: Optional[str] = None  # What the question is testing for
     tags: Set[str] = field(default_factory=set)
     elo_rating: float = 1200.0  # Starting ELO rating
@@ -50,7 +95,19 @@ class Question:
     interval_days: float = 1.0  # Spaced repetition interval
     ease_factor: float = 2.5  # Spaced repetition ease
     repetition_count: int = 0
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
+    # Answer ID -> answer, built on first lookup
+    _answers_by_id: Optional[Dict[str, Answer]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        if type(self.answers) is not tuple:
+            self.answers = tuple(self.answers)
+    
+    def record_answer(self, correct: bool) -> None:
+        """Count an answer to this question"""
+        self.times_answered += 1
+        if correct:
+            self.times_correct += 1
     
     @property
     def correct_answer(self) -> Optional[Answer]:
@@ -60,6 +117,14 @@ class Question:
                 return answer
         return None
     
+    def get_answer(self, answer_id: str) -> Optional[Answer]:
+        """Get one of this question's answers by ID"""
+        answers_by_id = self._answers_by_id
+        if answers_by_id is None:
+            # Built in reverse so the first answer wins if IDs repeat
+            answers_by_id = self._answers_by_id = {answer.id: answer for answer in reversed(self.answers)}
+        return answers_by_id.get(answer_id)
+    
     @property
     def incorrect_answers(self) -> List[Answer]:
         """Get all incorrect answers for this question"""
@@ -72,6 +137,17 @@ class Question:
             return 0.0
         return (self.times_correct / self.times_answered) * 100
     
+    def reset_progress(self) -> None:
+        """Reset rating, statistics and review schedule to their initial values"""
+        self.elo_rating = 1200.0
+        self.times_answered = 0
+        self.times_correct = 0
+        self.last_studied = None
+        self.next_review = None
+        self.interval_days = 1.0
+        self.ease_factor = 2.5
+        self.repetition_count = 0
+    
     def add_tag(self, tag: str) -> None:
         """Add a tag to this question"""
         self.tags.add(tag.lower().strip())
@@ -85,14 +161,46 @@ class Question:
         return tag.lower().strip() in self.tags
 
 
-@dataclass 
+@dataclass(slots=True)
 class StudySession:
-    """Represents a study session with questions and results"""
+    """
+    Represents a study session with questions and results
+    
+    Result counts are kept alongside results; add results through
+    record_result() so they stay current.
+    """
     questions_studied: List[str]  # Question IDs
     results: Dict[str, AnswerResult]  # Question ID -> Result
     start_time: datetime = field(default_factory=datetime.now)
     end_time: Optional[datetime] = None
-    session_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    session_id: str = field(default_factory=_new_id)
+    # Number of results of each kind
+    correct_count: int = field(default=0, init=False, repr=False, compare=False)
+    incorrect_count: int = field(default=0, init=False, repr=False, compare=False)
+    skipped_count: int = field(default=0, init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        counts = Counter(self.results.values())
+        self.correct_count = counts[AnswerResult.CORRECT]
+        self.incorrect_count = counts[AnswerResult.INCORRECT]
+        self.skipped_count = counts[AnswerResult.SKIPPED]
+    
+    def _adjust_count(self, result: AnswerResult, delta: int) -> None:
+        """Add delta to the counter for one kind of result"""
+        if result == AnswerResult.CORRECT:
+            self.correct_count += delta
+        elif result == AnswerResult.INCORRECT:
+            self.incorrect_count += delta
+        else:
+            self.skipped_count += delta
+    
+    def record_result(self, question_id: str, result: AnswerResult) -> None:
+        """Record the result for a question, replacing any earlier result for it"""
+        previous = self.results.get(question_id)
+        if previous is not None:
+            self._adjust_count(previous, -1)
+        self.results[question_id] = result
+        self._adjust_count(result, 1)
     
     @property
     def duration(self) -> Optional[timedelta]:
@@ -106,21 +214,6 @@ class StudySession:
         """Get total number of questions in session"""
         return len(self.questions_studied)
     
-    @property
-    def correct_count(self) -> int:
-        """Get number of correct answers"""
-        return sum(1 for result in self.results.values() if result == AnswerResult.CORRECT)
-    
-    @property
-    def incorrect_count(self) -> int:
-        """Get number of incorrect answers"""
-        return sum(1 for result in self.results.values() if result == AnswerResult.INCORRECT)
-    
-    @property
-    def skipped_count(self) -> int:
-        """Get number of skipped questions"""
-        return sum(1 for result in self.results.values() if result == AnswerResult.SKIPPED)
-    
     @property
     def accuracy(self) -> float:
         """Calculate accuracy percentage for this session"""
@@ -130,66 +223,287 @@ class StudySession:
         return (self.correct_count / answered) * 100
 
 
-@dataclass
+@dataclass(slots=True)
 class QuestionBank:
-    """Main question bank containing all questions and study sessions"""
+    """
+    Main question bank containing all questions and study sessions.
+    
+    The bank keeps a review index sorted by next_review. Code that changes a
+    question's next_review outside of the manager must call reschedule()
+    (or rebuild_review_index() after bulk changes) to keep it in sync; the
+    version property counts those updates, so direct next_review edits that
+    skip them are invisible to anything keyed on it.
+    Likewise, change the tags of a question in the bank through
+    tag_question() and untag_question() so the tag index stays current.
+    Searches run against a text index and a result cache taken when a
+    question is added; call reindex_question() after editing a question's
+    text or answers so searches see the change.
+    """
     questions: Dict[str, Question] = field(default_factory=dict)
     study_sessions: List[StudySession] = field(default_factory=list)
     name: str = "Default Question Bank"
     created_at: datetime = field(default_factory=datetime.now)
+    # Inverted index: tag -> IDs of questions carrying that tag (dict keeps insertion order)
+    _tag_index: Dict[str, Dict[str, None]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # LRU cache: lowercased query -> matching questions, cleared whenever questions are added or removed
+    _search_cache: "OrderedDict[str, Tuple[Question, ...]]" = field(
+        default_factory=OrderedDict, init=False, repr=False, compare=False
+    )
+    
+    # Search index: lowercased question/answer text per question, and word token -> question IDs
+    _search_text: Dict[str, str] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _token_index: Dict[str, Set[str]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    # Review index: (next_review, seq, question_id) kept sorted; unscheduled questions sort first
+    _review_index: List[Tuple[datetime, int, str]] = field(default_factory=list, init=False, repr=False, compare=False)
+    _review_keys: Dict[str, Tuple[datetime, int, str]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _review_seq: "itertools.count[int]" = field(default_factory=itertools.count, init=False, repr=False, compare=False)
+    # Bumped on every review index change; the due list is memoized against it
+    _version: int = field(default=0, init=False, repr=False, compare=False)
+    _due_cache: Optional[Tuple[int, datetime, Tuple[Question, ...]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def __post_init__(self) -> None:
+        for question in self.questions.values():
+            self._index_tags(question)
+            self._index_text(question)
+        self.rebuild_review_index()
+    
+    def _index_tags(self, question: Question) -> None:
+        """Add a question's tags to the tag index"""
+        for tag in question.tags:
+            self._tag_index.setdefault(tag, {})[question.id] = None
+    
+    def _unindex_tags(self, question: Question) -> None:
+        """Remove a question's tags from the tag index"""
+        for tag in question.tags:
+            question_ids = self._tag_index.get(tag)
+            if question_ids is not None:
+                question_ids.pop(question.id, None)
+                if not question_ids:
+                    del self._tag_index[tag]
+    
+    def _index_text(self, question: Question) -> None:
+        """Add a question's lowercased text and word tokens to the search index"""
+        text = SEARCH_FIELD_SEPARATOR.join(
+            [question.question_text, *(answer.text for answer in question.answers)]
+        ).lower()
+        self._search_text[question.id] = text
+        for token in set(_TOKEN_RE.findall(text)):
+            self._token_index.setdefault(token, set()).add(question.id)
+    
+    def _unindex_text(self, question_id: str) -> None:
+        """Remove a question from the search index"""
+        text = self._search_text.pop(question_id, None)
+        if text is None:
+            return
+        for token in set(_TOKEN_RE.findall(text)):
+            question_ids = self._token_index.get(token)
+            if question_ids is not None:
+                question_ids.discard(question_id)
+                if not question_ids:
+                    del self._token_index[token]
+    
+    def _index_review(self, question: Question) -> None:
+        """Insert or move a question in the review index"""
+        old_key = self._review_keys.get(question.id)
+        if old_key is not None:
+            del self._review_index[bisect_left(self._review_index, old_key)]
+            seq = old_key[1]
+        else:
+            seq = next(self._review_seq)
+        key = (question.next_review or datetime.min, seq, question.id)
+        insort(self._review_index, key)
+        self._review_keys[question.id] = key
+        self._version += 1
+    
+    def _unindex_review(self, question_id: str) -> None:
+        """Remove a question from the review index"""
+        key = self._review_keys.pop(question_id, None)
+        if key is not None:
+            del self._review_index[bisect_left(self._review_index, key)]
+            self._version += 1
     
     def add_question(self, question: Question) -> None:
         """Add a question to the bank"""
+        existing = self.questions.get(question.id)
+        if existing is not None:
+            self._unindex_tags(existing)
+            self._unindex_text(existing.id)
         self.questions[question.id] = question
+        self._index_tags(question)
+        self._index_text(question)
+        self._index_review(question)
+        self._search_cache.clear()
+    
+    def add_questions(self, questions: Iterable[Question]) -> None:
+        """Add many questions, re-sorting the review index once for the whole batch"""
+        keys = self._review_keys
+        seq = self._review_seq
+        for question in questions:
+            existing = self.questions.get(question.id)
+            if existing is not None:
+                self._unindex_tags(existing)
+                self._unindex_text(existing.id)
+            self.questions[question.id] = question
+            self._index_tags(question)
+            self._index_text(question)
+            old_key = keys.get(question.id)
+            keys[question.id] = (
+                question.next_review or datetime.min,
+                old_key[1] if old_key is not None else next(seq),
+                question.id
+            )
+        self._review_index[:] = sorted(keys.values())
+        self._version += 1
+        self._search_cache.clear()
     
     def remove_question(self, question_id: str) -> bool:
         """Remove a question from the bank"""
         if question_id in self.questions:
-            del self.questions[question_id]
+            self._unindex_tags(self.questions.pop(question_id))
+            self._unindex_text(question_id)
+            self._unindex_review(question_id)
+            self._search_cache.clear()
             return True
         return False
     
+    def reindex_question(self, question: Question) -> None:
+        """Refresh the search index after a question's text or answers changed"""
+        if question.id in self.questions:
+            self._unindex_text(question.id)
+            self._index_text(question)
+            self._search_cache.clear()
+    
+    @property
+    def version(self) -> int:
+        """Counter bumped whenever the review index changes"""
+        return self._version
+    
+    def reschedule(self, question: Question) -> None:
+        """Update the review index after a question's next_review changed"""
+        if question.id in self.questions:
+            self._index_review(question)
+    
+    def rebuild_review_index(self) -> None:
+        """Rebuild the review index from scratch, e.g. after bulk schedule changes"""
+        seq = self._review_seq
+        keys = self._review_keys
+        keys.clear()
+        for question_id, question in self.questions.items():
+            keys[question_id] = (question.next_review or datetime.min, next(seq), question_id)
+        self._review_index[:] = sorted(keys.values())
+        self._version += 1
+    
     def get_question(self, question_id: str) -> Optional[Question]:
         """Get a question by ID"""
         return self.questions.get(question_id)
     
+    def tag_question(self, question_id: str, tag: str) -> bool:
+        """Add a tag to a question in the bank and to the tag index"""
+        question = self.questions.get(question_id)
+        if question is None:
+            return False
+        question.add_tag(tag)
+        self._tag_index.setdefault(tag.lower().strip(), {})[question_id] = None
+        return True
+    
+    def untag_question(self, question_id: str, tag: str) -> bool:
+        """Remove a tag from a question in the bank and from the tag index"""
+        question = self.questions.get(question_id)
+        if question is None:
+            return False
+        tag = tag.lower().strip()
+        question.remove_tag(tag)
+        question_ids = self._tag_index.get(tag)
+        if question_ids is not None:
+            question_ids.pop(question_id, None)
+            if not question_ids:
+                del self._tag_index[tag]
+        return True
+    
     def get_questions_by_tag(self, tag: str) -> List[Question]:
         """Get all questions with a specific tag"""
-        return [q for q in self.questions.values() if q.has_tag(tag)]
+        question_ids = self._tag_index.get(tag.lower().strip(), ())
+        return [self.questions[qid] for qid in question_ids]
     
     def get_all_tags(self) -> Set[str]:
         """Get all unique tags across all questions"""
-        all_tags = set()
-        for question in self.questions.values():
-            all_tags.update(question.tags)
-        return all_tags
+        return set(self._tag_index)
+    
+    def get_tag_counts(self) -> Dict[str, int]:
+        """Get the number of questions carrying each tag"""
+        return {tag: len(question_ids) for tag, question_ids in self._tag_index.items()}
     
     def search_questions(self, query: str) -> List[Question]:
         """Search questions by text content"""
         query_lower = query.lower()
-        results = []
+        cached = self._search_cache.get(query_lower)
+        if cached is not None:
+            self._search_cache.move_to_end(query_lower)
+            return list(cached)
         
-        for question in self.questions.values():
-            # Search in question text
-            if query_lower in question.question_text.lower():
-                results.append(question)
-                continue
-            
-            # Search in answer text
-            for answer in question.answers:
-                if query_lower in answer.text.lower():
-                    results.append(question)
-                    break
+        # A match must contain each word of the query inside one indexed token. Words with
+        # non-word characters on both sides in the query must be whole tokens, so their
+        # buckets are intersected directly; otherwise only questions with a token
+        # containing the longest query word can match
+        matches = list(_TOKEN_RE.finditer(query_lower))
+        if matches:
+            exact = [
+                match.group() for match in matches
+                if match.start() > 0 and match.end() < len(query_lower)
+            ]
+            if exact:
+                token_index = self._token_index
+                buckets = sorted((token_index.get(token, set()) for token in exact), key=len)
+                candidates = buckets[0].intersection(*buckets[1:])
+            else:
+                needle = max((match.group() for match in matches), key=len)
+                candidates = set()
+                for token, question_ids in self._token_index.items():
+                    if needle in token:
+                        candidates |= question_ids
+            # Review sequence numbers follow insertion order, keeping results in bank order
+            review_keys = self._review_keys
+            candidate_ids = sorted(candidates, key=lambda qid: review_keys[qid][1])
+        else:
+            candidate_ids = self.questions
+        
+        # Confirm substring matches against the question and answer texts
+        search_text = self._search_text
+        results = [self.questions[qid] for qid in candidate_ids if query_lower in search_text[qid]]
         
+        self._search_cache[query_lower] = tuple(results)
+        if len(self._search_cache) > SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
         return results
     
-    def get_questions_due_for_review(self) -> List[Question]:
-        """Get questions that are due for spaced repetition review"""
+    def _due_questions(self) -> Tuple[Question, ...]:
+        """
+        Questions due now, earliest first.
+        
+        The result is reused until the review index changes or the next
+        scheduled review comes due.
+        """
         now = datetime.now()
-        return [
-            q for q in self.questions.values() 
-            if q.next_review is None or q.next_review <= now
-        ]
+        cache = self._due_cache
+        if cache is None or cache[0] != self._version or now >= cache[1]:
+            index = self._review_index
+            end = bisect_right(index, (now, math.inf))
+            valid_until = index[end][0] if end < len(index) else datetime.max
+            due = tuple(self.questions[qid] for _, _, qid in index[:end])
+            cache = self._due_cache = (self._version, valid_until, due)
+        return cache[2]
+    
+    def get_questions_due_for_review(self, limit: Optional[int] = None) -> List[Question]:
+        """Get questions that are due for spaced repetition review, earliest first"""
+        due = self._due_questions()
+        return list(due[:limit] if limit is not None else due)
+    
+    def count_questions_due(self) -> int:
+        """Count questions that are due for spaced repetition review"""
+        return len(self._due_questions())
     
     def get_statistics(self) -> Dict:
         """Get overall statistics for the question bank"""
@@ -208,45 +522,38 @@ class QuestionBank:
         accuracies = [q.accuracy for q in self.questions.values() if q.times_answered > 0]
         avg_accuracy = sum(accuracies) / len(accuracies) if accuracies else 0.0
         
-        # Find most difficult questions (lowest ELO or accuracy)
-        sorted_by_difficulty = sorted(
-            self.questions.values(), 
-            key=lambda q: (q.elo_rating, q.accuracy) if q.times_answered > 0 else (q.elo_rating, 0)
-        )
-        
-        # Count tag usage
-        tag_counts = {}
-        for question in self.questions.values():
-            for tag in question.tags:
-                tag_counts[tag] = tag_counts.get(tag, 0) + 1
+        # Find most difficult questions (lowest ELO or accuracy); unanswered questions have accuracy 0.
+        # Only the five at each end are needed, so select them instead of sorting every question.
+        # The sort keys are computed once and shared by both selections.
+        questions = list(self.questions.values())
+        keys = [(q.elo_rating, q.accuracy) for q in questions]
+        positions = range(total_questions)
+        most_difficult = [questions[i] for i in heapq.nsmallest(5, positions, key=keys.__getitem__)]
+        # Position breaks ties so the easiest match the tail of a stable ascending sort
+        easiest_positions = heapq.nlargest(5, positions, key=lambda i: (keys[i], i))
+        easiest = [questions[i] for i in reversed(easiest_positions)]
         
-        most_studied_tags = sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        # Tag usage comes straight from the tag index
+        most_studied_tags = Counter(self.get_tag_counts()).most_common(10)
         
         return {
             "total_questions": total_questions,
             "total_sessions": len(self.study_sessions),
             "average_accuracy": avg_accuracy,
-            "most_difficult_questions": sorted_by_difficulty[:5],
-            "easiest_questions": sorted_by_difficulty[-5:],
+            "most_difficult_questions": most_difficult,
+            "easiest_questions": easiest,
             "most_studied_tags": most_studied_tags,
-            "questions_due_for_review": len(self.get_questions_due_for_review())
+            "questions_due_for_review": self.count_questions_due()
         }
     
     def export_to_json(self, filepath: str) -> None:
         """Export question bank to JSON file"""
-        def serialize_datetime(obj):
-            if isinstance(obj, datetime):
-                return obj.isoformat()
-            elif isinstance(obj, set):
-                return list(obj)
-            elif isinstance(obj, Enum):
-                return obj.value
-            raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
-        
-        # Convert to serializable format
+        # Convert to serializable format; datetimes are formatted up front so the
+        # encoder never has to call back into Python for a fallback serializer
         data = {
+            "format_version": BANK_FORMAT_VERSION,
             "name": self.name,
-            "created_at": self.created_at,
+            "created_at": self.created_at.isoformat(),
             "questions": {qid: {
                 "id": q.id,
                 "question_text": q.question_text,
@@ -261,9 +568,9 @@ class QuestionBank:
                 "elo_rating": q.elo_rating,
                 "times_answered": q.times_answered,
                 "times_correct": q.times_correct,
-                "created_at": q.created_at,
-                "last_studied": q.last_studied,
-                "next_review": q.next_review,
+                "created_at": q.created_at.isoformat(),
+                "last_studied": _isoformat(q.last_studied),
+                "next_review": _isoformat(q.next_review),
                 "interval_days": q.interval_days,
                 "ease_factor": q.ease_factor,
                 "repetition_count": q.repetition_count
@@ -272,61 +579,67 @@ class QuestionBank:
                 "session_id": s.session_id,
                 "questions_studied": s.questions_studied,
                 "results": {qid: result.value for qid, result in s.results.items()},
-                "start_time": s.start_time,
-                "end_time": s.end_time
+                "start_time": s.start_time.isoformat(),
+                "end_time": _isoformat(s.end_time)
             } for s in self.study_sessions]
         }
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, default=serialize_datetime, indent=2, ensure_ascii=False)
+        dump_json(data, filepath)
     
     @classmethod
     def import_from_json(cls, filepath: str) -> 'QuestionBank':
         """Import question bank from JSON file"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_bank_data(filepath)
         
         def parse_datetime(date_str):
             if date_str:
                 return datetime.fromisoformat(date_str)
             return datetime.now()  # Default fallback
         
-        bank = cls(name=data["name"], created_at=parse_datetime(data.get("created_at")))
+        if data.get("format_version") == BANK_FORMAT_VERSION:
+            questions = cls._hydrate_trusted_questions(data["questions"], parse_datetime)
+        else:
+            questions = {}
+            for qid, q_data in data["questions"].items():
+                answers = tuple(
+                    Answer(
+                        id=a_data["id"],
+                        text=a_data["text"],
+                        is_correct=a_data["is_correct"],
+                        explanation=a_data.get("explanation")
+                    ) for a_data in q_data["answers"]
+                )
+                
+                question = Question(
+                    id=q_data["id"],
+                    question_text=q_data["question_text"],
+                    answers=answers,
+                    objective=q_data.get("objective"),
+                    tags=set(q_data["tags"]),
+                    elo_rating=q_data["elo_rating"],
+                    times_answered=q_data["times_answered"],
+                    times_correct=q_data["times_correct"],
+                    created_at=parse_datetime(q_data.get("created_at")),
+                    last_studied=parse_datetime(q_data.get("last_studied")),
+                    next_review=parse_datetime(q_data.get("next_review")),
+                    interval_days=q_data["interval_days"],
+                    ease_factor=q_data["ease_factor"],
+                    repetition_count=q_data["repetition_count"]
+                )
+                questions[question.id] = question
         
-        # Import questions
-        for qid, q_data in data["questions"].items():
-            answers = [
-                Answer(
-                    id=a_data["id"],
-                    text=a_data["text"],
-                    is_correct=a_data["is_correct"],
-                    explanation=a_data.get("explanation")
-                ) for a_data in q_data["answers"]
-            ]
-            
-            question = Question(
-                id=q_data["id"],
-                question_text=q_data["question_text"],
-                answers=answers,
-                objective=q_data.get("objective"),
-                tags=set(q_data["tags"]),
-                elo_rating=q_data["elo_rating"],
-                times_answered=q_data["times_answered"],
-                times_correct=q_data["times_correct"],
-                created_at=parse_datetime(q_data.get("created_at")),
-                last_studied=parse_datetime(q_data.get("last_studied")),
-                next_review=parse_datetime(q_data.get("next_review")),
-                interval_days=q_data["interval_days"],
-                ease_factor=q_data["ease_factor"],
-                repetition_count=q_data["repetition_count"]
-            )
-            bank.add_question(question)
+        # Indexes are built once for the whole set of questions
+        bank = cls(
+            name=data["name"],
+            created_at=parse_datetime(data.get("created_at")),
+            questions=questions
+        )
         
         # Import study sessions
         for s_data in data["study_sessions"]:
             session = StudySession(
                 session_id=s_data["session_id"],
-                questions_studied=s_data["questions_studied"],
+                questions_studied=list(s_data["questions_studied"]),
                 results={qid: AnswerResult(result) for qid, result in s_data["results"].items()},
                 start_time=parse_datetime(s_data.get("start_time")),
                 end_time=parse_datetime(s_data.get("end_time")) if s_data.get("end_time") else None
@@ -334,3 +647,43 @@ class QuestionBank:
             bank.study_sessions.append(session)
         
         return bank
+    
+    @staticmethod
+    def _hydrate_trusted_questions(questions_data: Dict[str, Dict], parse_datetime) -> Dict[str, Question]:
+        """
+        Rebuild questions from a file written by export_to_json.
+        
+        The data is known to be complete, so objects are filled in directly
+        instead of going through the dataclass constructors.
+        """
+        new_answer = Answer.__new__
+        new_question = Question.__new__
+        questions = {}
+        for qid, q_data in questions_data.items():
+            answers = []
+            for a_data in q_data["answers"]:
+                answer = new_answer(Answer)
+                answer.text = a_data["text"]
+                answer.is_correct = a_data["is_correct"]
+                answer.explanation = a_data["explanation"]
+                answer.id = a_data["id"]
+                answers.append(answer)
+            
+            question = new_question(Question)
+            question.question_text = q_data["question_text"]
+            question.answers = tuple(answers)
+            question._answers_by_id = {answer.id: answer for answer in reversed(answers)}
+            question.objective = q_data["objective"]
+            question.tags = set(q_data["tags"])
+            question.elo_rating = q_data["elo_rating"]
+            question.times_answered = q_data["times_answered"]
+            question.times_correct = q_data["times_correct"]
+            question.created_at = parse_datetime(q_data["created_at"])
+            question.last_studied = parse_datetime(q_data["last_studied"])
+            question.next_review = parse_datetime(q_data["next_review"])
+            question.interval_days = q_data["interval_days"]
+            question.ease_factor = q_data["ease_factor"]
+            question.repetition_count = q_data["repetition_count"]
+            question.id = q_data["id"]
+            questions[qid] = question
+        return questions
@@ -2,8 +2,9 @@
 Spaced repetition scheduler based on the SM-2 algorithm (similar to Anki).
 """
 
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import List, Optional, Tuple
+from typing import Callable, Iterable, List, Optional, Tuple
 from .models import Question, AnswerResult
 
 
@@ -173,31 +174,28 @@ class SpacedRepetitionScheduler:
         due_questions.sort(key=priority_key)
         return due_questions
     
-    def get_review_forecast(self, questions: List[Question], days: int = 30) -> dict:
+    def get_review_forecast(self, questions: Iterable[Question], days: int = 30) -> dict:
         """
         Get a forecast of how many questions will be due for review in the coming days.
         
         Args:
-            questions: List of questions to analyze
+            questions: Questions to analyze (iterated once)
             days: Number of days to forecast
             
         Returns:
             Dictionary with dates as keys and question counts as values
         """
-        current_time = datetime.now()
-        forecast = {}
+        today = datetime.now().date()
+        
+        # Count scheduled reviews per date in a single pass
+        counts = Counter(
+            question.next_review.date() for question in questions if question.next_review
+        )
         
+        forecast = {}
         for i in range(days):
-            date = current_time + timedelta(days=i)
-            date_key = date.strftime('%Y-%m-%d')
-            
-            count = 0
-            for question in questions:
-                if (question.next_review and 
-                    question.next_review.date() == date.date()):
-                    count += 1
-            
-            forecast[date_key] = count
+            date = today + timedelta(days=i)
+            forecast[date.strftime('%Y-%m-%d')] = counts[date]
         
         return forecast
     
@@ -247,12 +245,18 @@ class SpacedRepetitionScheduler:
         # Don't exceed available questions
         return min(max_questions, len(due_questions))
     
-    def optimize_review_schedule(self, questions: List[Question]) -> None:
+    def optimize_review_schedule(self, questions: List[Question],
+                                 on_reschedule: Optional[Callable[[Question], None]] = None) -> None:
         """
         Optimize the review schedule for a batch of questions to distribute workload.
         
+        Questions in a QuestionBank must have its review index updated when
+        they move: pass the bank's reschedule method as on_reschedule, or call
+        rebuild_review_index() on the bank afterwards.
+        
         Args:
             questions: Questions to optimize scheduling for
+            on_reschedule: Called with each question whose next_review was moved
         """
         # Sort questions by next review date
         scheduled_questions = [q for q in questions if q.next_review is not None]
@@ -281,6 +285,8 @@ class SpacedRepetitionScheduler:
                         # Update the question's next review time
                         time_part = question.next_review.time()
                         question.next_review = datetime.combine(candidate_date, time_part)
+                        if on_reschedule is not None:
+                            on_reschedule(question)
                     break
                 
                 days_offset += 1
@@ -421,6 +421,7 @@ class QBankWebApp:
         """Save question bank to file."""
         try:
             self.manager.export_bank(self.question_bank_file)
+            self.manager.mark_saved()
         except Exception as e:
             print(f"Error saving question bank: {e}")
     
@@ -29,12 +29,27 @@ class TestQuestionBankManager:
         
         assert question.question_text == "What is 2 + 2?"
         assert len(question.answers) == 4
+        assert isinstance(question.answers, tuple)
         assert question.correct_answer.text == "4"
         assert len(question.incorrect_answers) == 3
         assert "math" in question.tags
         assert "arithmetic" in question.tags
         assert question.elo_rating == 1200.0  # Starting rating
     
+    def test_accuracy_follows_answer_counts(self, manager):
+        """Test that accuracy reflects the answer counts however they are changed."""
+        question = manager.create_multiple_choice_question("What is 3 + 3?", "6", ["5"])
+        assert question.accuracy == 0.0
+        
+        question.record_answer(True)
+        question.record_answer(False)
+        assert question.accuracy == 50.0
+        
+        # Writing the counters directly is reflected too
+        question.times_answered = 4
+        question.times_correct = 3
+        assert question.accuracy == 75.0
+    
     def test_add_multiple_questions(self, manager):
         """Test adding multiple questions."""
         questions_data = [
@@ -61,6 +76,56 @@ class TestQuestionBankManager:
         paris_questions = manager.search_questions("Paris")
         assert len(paris_questions) == 1
         assert paris_questions[0].question_text == "What is the capital of France?"
+        
+        # Cached search results are invalidated when the bank changes
+        manager.create_multiple_choice_question(
+            "Which city hosts the Louvre?", "Paris", ["Rome", "Vienna"], ["geography"]
+        )
+        assert len(manager.search_questions("Paris")) == 2
+    
+    def test_bulk_create_from_generator(self, manager):
+        """Test bulk creation consumes a lazy stream of rows."""
+        rows = (
+            (f"Question {i}?", "Right", ["Wrong1", "Wrong2"], ["bulk"], None)
+            for i in range(5)
+        )
+        
+        created = manager.bulk_create_multiple_choice_questions(rows)
+        
+        assert len(created) == 5
+        assert len(manager.question_bank.questions) == 5
+        assert all(q.correct_answer.text == "Right" for q in created)
+        assert len(manager.get_questions_by_tag("bulk")) == 5
+    
+    def test_batch_add_updates_indexes(self, manager):
+        """Test that QuestionBank.add_questions keeps tag, search and review indexes current."""
+        bank = manager.question_bank
+        existing = manager.create_multiple_choice_question("Existing question", "Yes", ["No"], ["old"])
+        now = datetime.now()
+        
+        batch = [
+            Question(question_text="Batch later", answers=[Answer(text="A", is_correct=True)],
+                     tags={"batch"}, next_review=now + timedelta(days=2)),
+            Question(question_text="Batch due", answers=[Answer(text="B", is_correct=True)],
+                     tags={"batch", "due"}, next_review=now - timedelta(days=1)),
+            # Replaces the existing question under the same id
+            Question(question_text="Replacement question", answers=[Answer(text="C", is_correct=True)],
+                     tags={"new"}, next_review=now + timedelta(days=1), id=existing.id),
+        ]
+        assert manager.search_questions("question") == [existing]  # Cached before the batch
+        bank.add_questions(batch)
+        
+        assert len(bank.questions) == 3
+        assert bank.get_tag_counts() == {"batch": 2, "due": 1, "new": 1}
+        assert manager.search_questions("batch") == batch[:2]
+        assert manager.search_questions("question") == [batch[2]]
+        assert manager.search_questions("existing") == []
+        assert bank.get_questions_due_for_review() == [batch[1]]
+        
+        # The review index stays usable for later single updates
+        batch[0].next_review = now - timedelta(days=2)
+        bank.reschedule(batch[0])
+        assert bank.get_questions_due_for_review() == [batch[0], batch[1]]
     
     def test_study_session(self, manager):
         """Test a complete study session."""
@@ -109,6 +174,36 @@ class TestQuestionBankManager:
         assert session.incorrect_count == 1
         assert manager.current_session is None
     
+    def test_bulk_answer_questions(self, manager):
+        """Test submitting a session's answers in one call."""
+        for i in range(3):
+            manager.create_multiple_choice_question(
+                f"Question {i}?", "Right", ["Wrong"], ["bulk"]
+            )
+        
+        questions = manager.start_study_session()
+        
+        # An unknown answer rejects the whole batch before anything is applied
+        with pytest.raises(ValueError):
+            manager.bulk_answer_questions([
+                (questions[0].id, questions[0].correct_answer.id, 2.0),
+                (questions[1].id, "missing", 2.0)
+            ])
+        assert questions[0].times_answered == 0
+        
+        results = manager.bulk_answer_questions([
+            (questions[0].id, questions[0].correct_answer.id, 2.0),
+            (questions[1].id, questions[1].incorrect_answers[0].id, 4.0),
+            (questions[2].id, questions[2].correct_answer.id, None)
+        ])
+        assert [r['correct'] for r in results] == [True, False, True]
+        assert all(q.times_answered == 1 for q in questions)
+        assert questions[0].last_studied == questions[1].last_studied == questions[2].last_studied
+        
+        session = manager.end_study_session()
+        assert session.correct_count == 2
+        assert session.incorrect_count == 1
+    
     def test_elo_rating_system(self, manager):
         """Test that ELO ratings change appropriately."""
         question = manager.create_multiple_choice_question(
@@ -144,6 +239,7 @@ class TestQuestionBankManager:
         
         # Initially, no next review scheduled
         assert question.next_review is None
+        assert manager.question_bank.get_questions_due_for_review() == [question]
         assert question.repetition_count == 0
         assert question.interval_days == 1.0
         
@@ -163,6 +259,16 @@ class TestQuestionBankManager:
         # For SM-2 algorithm, first correct answer should give 1 day interval
         interval_hours = (question.next_review - question.last_studied).total_seconds() / 3600
         assert 20 <= interval_hours <= 28  # Between 20-28 hours (allowing for some variation)
+        
+        # Rescheduled question leaves the due list
+        assert manager.question_bank.count_questions_due() == 0
+        assert manager.question_bank.get_questions_due_for_review() == []
+        
+        # Resetting progress makes it due again with default scheduling
+        manager.reset_progress()
+        assert question.next_review is None
+        assert question.repetition_count == 0
+        assert manager.question_bank.get_questions_due_for_review() == [question]
     
     def test_tags_and_filtering(self, manager):
         """Test tag-based filtering."""
@@ -188,6 +294,48 @@ class TestQuestionBankManager:
         all_tags = manager.get_all_tags()
         expected_tags = {"math", "easy", "hard", "history"}
         assert all_tags == expected_tags
+        assert manager.get_tag_counts() == {"math": 2, "easy": 1, "hard": 1, "history": 1}
+        
+        # Removing a question drops it from the tag index
+        manager.remove_question(history_questions[0].id)
+        assert manager.get_questions_by_tag("history") == []
+        assert "history" not in manager.get_all_tags()
+        
+        # Tagging through the manager keeps the tag index in sync
+        question = math_questions[0]
+        assert manager.tag_question(question.id, "Review")
+        assert manager.get_questions_by_tag("review") == [question]
+        assert manager.untag_question(question.id, "review")
+        assert "review" not in manager.get_all_tags()
+        assert not manager.tag_question("missing", "review")
+    
+    def test_search_questions(self, manager):
+        """Test substring and multi-word text search."""
+        capital = manager.create_multiple_choice_question(
+            "What is the capital of France?", "Paris", ["Lyon"], ["geography"]
+        )
+        river = manager.create_multiple_choice_question(
+            "Which river flows through Paris?", "The Seine", ["The Thames"], ["geography"]
+        )
+        
+        # Substrings inside words, across word boundaries and in answers
+        assert manager.search_questions("capit") == [capital]
+        assert manager.search_questions("is the capital of") == [capital]
+        assert manager.search_questions("CAPITAL OF FRANCE?") == [capital]
+        assert manager.search_questions("paris") == [capital, river]
+        assert manager.search_questions("the seine") == [river]
+        assert manager.search_questions("capital of spain") == []
+        
+        # Removed questions disappear from results, including cached queries
+        manager.remove_question(capital.id)
+        assert manager.search_questions("paris") == [river]
+        assert manager.search_questions("is the capital of") == []
+        
+        # Edited text is searchable once the question is re-indexed
+        river.question_text = "Which river flows through London?"
+        manager.question_bank.reindex_question(river)
+        assert manager.search_questions("london") == [river]
+        assert manager.search_questions("through paris") == []
     
     def test_statistics(self, manager):
         """Test statistics gathering."""
@@ -204,6 +352,9 @@ class TestQuestionBankManager:
         assert stats['total_questions'] == 2
         assert stats['total_sessions'] == 0
         assert stats['questions_due'] == 2
+        breakdown = manager.get_performance_breakdown()
+        assert breakdown['subjects'] == {}
+        assert breakdown['difficulty']['Medium'] == 2
         
         # Do a study session
         questions = manager.start_study_session()
@@ -216,6 +367,7 @@ class TestQuestionBankManager:
         assert stats['total_sessions'] == 1
         assert stats['recent_accuracy'] == 100.0
         assert stats['questions_due'] == 0  # All scheduled for tomorrow
+        assert manager.get_performance_breakdown()['subjects'] == {'test': (2, 2)}
     
     def test_export_import(self, manager):
         """Test exporting and importing question banks."""
@@ -234,11 +386,16 @@ class TestQuestionBankManager:
             tmp_path = tmp.name
         
         try:
+            assert manager.dirty
             manager.export_bank(tmp_path)
+            assert manager.dirty  # An export may be a copy; only mark_saved() clears the flag
+            manager.mark_saved()
+            assert not manager.dirty
             
             # Create new manager and import
             new_manager = QuestionBankManager("Imported Bank", "test_user")
             new_manager.import_bank(tmp_path)
+            assert not new_manager.dirty
             
             # Check that data was imported correctly
             assert len(new_manager.question_bank.questions) == 1
@@ -254,6 +411,73 @@ class TestQuestionBankManager:
                 os.unlink(tmp_path)
 
 
+class TestAdvancedAnalytics:
+    """Test session recording and comparative analytics."""
+    
+    @staticmethod
+    def make_session(session_id, user_id, hours_ago, attempted, correct):
+        from qbank.analytics import LearningSession
+        
+        start = datetime(2024, 1, 10, 12) - timedelta(hours=hours_ago)
+        return LearningSession(
+            session_id=session_id, user_id=user_id, start_time=start,
+            end_time=start + timedelta(minutes=20), questions_attempted=attempted,
+            questions_correct=correct, total_response_time=attempted * 10.0,
+            subjects_practiced=["math"]
+        )
+    
+    def test_record_sessions_matches_single_records(self):
+        """Test that a batch replay gives the same results as recording sessions one by one."""
+        from qbank.analytics import AdvancedAnalytics
+        
+        sessions = [
+            self.make_session("s1", "alice", 5, 10, 5),
+            self.make_session("s2", "bob", 4, 10, 8),
+            self.make_session("s3", "alice", 3, 10, 9),
+            self.make_session("s4", "carol", 2, 10, 6),
+            self.make_session("s2", "bob", 1, 10, 4),  # Re-recorded session replaces the earlier one
+        ]
+        
+        single = AdvancedAnalytics()
+        for session in sessions:
+            single.record_session(session)
+        batch = AdvancedAnalytics()
+        batch.record_sessions(sessions)
+        
+        for user_id in ("alice", "bob", "carol"):
+            assert batch.get_learning_insights(user_id) == single.get_learning_insights(user_id)
+            assert batch.get_comparative_analytics(user_id) == single.get_comparative_analytics(user_id)
+    
+    def test_standings_and_cache_invalidation(self):
+        """Test percentiles and averages, and that new sessions refresh cached reports."""
+        from qbank.analytics import AdvancedAnalytics
+        
+        analytics = AdvancedAnalytics()
+        analytics.record_sessions([
+            self.make_session("s1", "alice", 3, 10, 5),
+            self.make_session("s2", "bob", 2, 10, 8),
+            self.make_session("s3", "carol", 1, 10, 9),
+        ])
+        
+        comparison = analytics.get_comparative_analytics("bob")
+        assert comparison["system_average_accuracy"] == pytest.approx(220 / 3)
+        assert comparison["accuracy_percentile"] == pytest.approx(200 / 3)
+        assert analytics.get_learning_insights("alice")["overview"]["total_questions"] == 10
+        
+        # Returned reports are copies, so changing them leaves the cache intact
+        comparison.clear()
+        analytics.get_learning_insights("alice")["recommendations"].append("changed")
+        assert analytics.get_comparative_analytics("bob")["accuracy_percentile"] == pytest.approx(200 / 3)
+        assert "changed" not in analytics.get_learning_insights("alice")["recommendations"]
+        
+        # A new session for alice moves her above bob and refreshes both reports
+        analytics.record_session(self.make_session("s4", "alice", 0, 30, 30))
+        assert analytics.get_learning_insights("alice")["overview"]["total_questions"] == 40
+        assert analytics.get_comparative_analytics("alice")["user_accuracy"] == 87.5
+        assert analytics.get_comparative_analytics("bob")["accuracy_percentile"] == pytest.approx(100 / 3)
+        assert analytics.get_comparative_analytics("bob")["system_average_accuracy"] == pytest.approx(257.5 / 3)
+
+
 class TestSpacedRepetitionScheduler:
     """Test the spaced repetition scheduler."""
     
@@ -332,6 +556,69 @@ class TestELORatingSystem:
         assert elo.get_difficulty_category(1500) == "Hard"
         assert elo.get_difficulty_category(1700) == "Very Hard"
         assert elo.get_difficulty_category(1900) == "Expert"
+    
+    def test_batch_rating_updates_match_sequential(self):
+        """Test that update_user_ratings matches one update_user_rating call per answer."""
+        from qbank.elo_rating import UserRatingTracker
+        
+        def make_questions():
+            return [
+                Question(question_text=f"Q{i}", answers=[Answer(text="A", is_correct=True)],
+                         elo_rating=1100.0 + 50 * i)
+                for i in range(4)
+            ]
+        
+        results = [AnswerResult.CORRECT, AnswerResult.SKIPPED, AnswerResult.INCORRECT, AnswerResult.CORRECT]
+        
+        sequential_tracker = UserRatingTracker()
+        sequential_questions = make_questions()
+        expected = [
+            sequential_tracker.update_user_rating("user", question, result)
+            for question, result in zip(sequential_questions, results)
+        ]
+        
+        batch_tracker = UserRatingTracker()
+        batch_questions = make_questions()
+        assert batch_tracker.update_user_ratings("user", zip(batch_questions, results)) == expected
+        assert batch_tracker.get_user_rating("user") == sequential_tracker.get_user_rating("user")
+        assert [q.elo_rating for q in batch_questions] == [q.elo_rating for q in sequential_questions]
+        assert expected[1][1] == 1150.0  # Skips leave the question rating unchanged
+
+
+class TestCurriculumManager:
+    """Test learning path progression."""
+    
+    def test_prerequisites_unlock_modules(self):
+        """Test that modules unlock as their prerequisites are completed."""
+        from qbank.curriculum import CurriculumManager, CURRICULUM_TEMPLATES
+        
+        curriculum = CurriculumManager()
+        curriculum.create_learning_path(CURRICULUM_TEMPLATES["python_fundamentals"])
+        assert curriculum.enroll_user("student", "python_fundamentals")
+        
+        assert curriculum.get_next_module("student", "python_fundamentals").id == "python_basics"
+        assert not curriculum.start_module("student", "python_fundamentals", "control_structures")
+        assert curriculum.start_module("student", "python_fundamentals", "python_basics")
+        assert curriculum.complete_module("student", "python_fundamentals", "python_basics")
+        
+        assert curriculum.get_next_module("student", "python_fundamentals").id == "control_structures"
+        progress = curriculum.get_user_progress("student", "python_fundamentals")
+        assert [m["id"] for m in progress["next_available_modules"]] == ["control_structures"]
+        assert curriculum.start_module("student", "python_fundamentals", "control_structures")
+    
+    def test_added_module_is_available(self):
+        """Test that a module added after enrollment is available to enrolled users."""
+        from qbank.curriculum import CurriculumManager, CURRICULUM_TEMPLATES, LearningModule
+        
+        curriculum = CurriculumManager()
+        path = curriculum.create_learning_path(CURRICULUM_TEMPLATES["python_fundamentals"])
+        assert curriculum.enroll_user("student", "python_fundamentals")
+        assert curriculum.get_next_module("student", "python_fundamentals").id == "python_basics"
+        
+        path.add_module(LearningModule(id="style", name="Style", description="PEP 8"))
+        progress = curriculum.get_user_progress("student", "python_fundamentals")
+        assert [m["id"] for m in progress["next_available_modules"]] == ["python_basics", "style"]
+        assert curriculum.start_module("student", "python_fundamentals", "style")
 
 
 if __name__ == "__main__":